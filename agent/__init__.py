@@ -1,4 +1,5 @@
 # COMP30024 Artificial Intelligence, Semester 1 2025
 # Project Part B: Game Playing Agent
 
-from .program import Agent
+from .program import Agent, ParallelAgent
+from .mcts import MCTSAgent
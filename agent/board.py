@@ -1,66 +1,254 @@
-from referee.game import Coord, PlayerColor, Direction
-from .utils.board_utils import is_within_bounds
+import random
+from dataclasses import dataclass
+
+from referee.game import Coord, PlayerColor, Direction, Action, MoveAction, \
+    GrowAction, BOARD_N
+from .utils.board_utils import ROW_MASK, STEP, JUMP, NEIGHBOURS, square, \
+    coord_of, row_bits, iter_squares
 from typing import Set
 
+# Side indices into `Board.frogs`
+ME, ENEMY = 0, 1
+
+FORWARD_DIRECTIONS = {
+    PlayerColor.RED: [Direction.Down, Direction.DownLeft, Direction.DownRight],
+    PlayerColor.BLUE: [Direction.Up, Direction.UpLeft, Direction.UpRight],
+}
+
+# Directions in move generation order: forward moves first, then sideways
+LEGAL_DIRECTIONS = {
+    color: dirs + [Direction.Right, Direction.Left]
+    for color, dirs in FORWARD_DIRECTIONS.items()
+}
+
+# (direction, single-step path, STEP table, JUMP table) in the same order, so
+# move generation can walk the lookup tables without hashing directions
+LEGAL_TABLES = {
+    color: [(d, (d,), STEP[d], JUMP[d]) for d in dirs]
+    for color, dirs in LEGAL_DIRECTIONS.items()
+}
+
+# Zobrist keys: one random 64-bit value per (piece, square), plus one for the
+# side to move. Seeded so that keys are stable between runs.
+_zobrist_rng = random.Random(30024)
+ZOBRIST_FROG = [
+    [_zobrist_rng.getrandbits(64) for _ in range(BOARD_N * BOARD_N)]
+    for _ in (ME, ENEMY)
+]
+ZOBRIST_PAD = [_zobrist_rng.getrandbits(64) for _ in range(BOARD_N * BOARD_N)]
+ZOBRIST_ENEMY_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+@dataclass(frozen=True, slots=True)
+class UndoToken:
+    """
+    The cells changed by one `Board.make` call, in the spirit of the referee's
+    `CellMutation`s: a move vacates `start` and fills `dest`, a grow adds the
+    lily pads in the `grown` mask.
+    """
+    side: int
+    start: int
+    dest: int
+    grown: int
+    key: int
+
 class Board:
+    """
+    Bitboard representation of the game state from our agent's perspective.
+    `frogs[ME]` and `frogs[ENEMY]` hold one bit per occupied square, and `pads`
+    holds the lily pads that are not currently under a frog. `reached` and
+    `distance` are running per-side totals for the evaluation function: frogs
+    on their goal row, and the sum of frog row distances to the goal row.
+    """
     def __init__(self, color: PlayerColor):
         self.color = color
-        self.my_frogs: Set[Coord] = set()
-        self.enemy_frogs: Set[Coord] = set()
-        self.lilypads: Set[Coord] = set()
+        self.colors = (color, color.opponent)
+        self.goal_row = BOARD_N - 1 if color == PlayerColor.RED else 0
+        self.enemy_goal_row = BOARD_N - 1 - self.goal_row
+        self.goal_rows = (self.goal_row, self.enemy_goal_row)
+        self.frogs = [0, 0]
+        self.pads = 0
+        self.reached = [0, 0]
+        self.distance = [0, 0]
+        # RED always opens the game
+        self.to_move = ME if color == PlayerColor.RED else ENEMY
+        self.key = self.compute_key()
 
     def initialize(self):
-        red_row, blue_row = 0, 7
-        for col in range(1, 7):
-            red = Coord(red_row, col)
-            blue = Coord(blue_row, col)
-            self.lilypads.update({red, blue})
-            if self.color == PlayerColor.RED:
-                self.my_frogs.add(red)
-                self.enemy_frogs.add(blue)
-            else:
-                self.my_frogs.add(blue)
-                self.enemy_frogs.add(red)
+        red_row, blue_row = 0, BOARD_N - 1
+        red, blue, pads = 0, 0, 0
+        for col in range(1, BOARD_N - 1):
+            red |= 1 << square(red_row, col)
+            blue |= 1 << square(blue_row, col)
+            pads |= 1 << square(red_row + 1, col)
+            pads |= 1 << square(blue_row - 1, col)
+        for row in (red_row, blue_row):
+            for col in (0, BOARD_N - 1):
+                pads |= 1 << square(row, col)
+
+        self.pads = pads
+        if self.color == PlayerColor.RED:
+            self.frogs = [red, blue]
+        else:
+            self.frogs = [blue, red]
+        self.key = self.compute_key()
+        for side in (ME, ENEMY):
+            self.reached[side], self.distance[side] = self.tally(side)
+
+    def tally(self, side: int) -> tuple[int, int]:
+        """
+        (frogs on the goal row, total row distance to the goal row) for
+        `side`, computed from scratch. `make` and `unmake` keep `reached` and
+        `distance` equal to this incrementally.
+        """
+        goal_row = self.goal_rows[side]
+        frogs = self.frogs[side]
+        reached = row_bits(frogs, goal_row).bit_count()
+        distance = sum(row_bits(frogs, r).bit_count() * abs(r - goal_row)
+                       for r in range(BOARD_N))
+        return reached, distance
+
+    def compute_key(self) -> int:
+        """
+        Zobrist key of the current position, computed from scratch. `make`
+        and `unmake` keep `self.key` equal to this incrementally.
+        """
+        key = ZOBRIST_ENEMY_TO_MOVE if self.to_move == ENEMY else 0
+        for side in (ME, ENEMY):
+            for sq in iter_squares(self.frogs[side]):
+                key ^= ZOBRIST_FROG[side][sq]
+        for sq in iter_squares(self.pads):
+            key ^= ZOBRIST_PAD[sq]
+        return key
+
+    # --- set-of-Coord views, kept for callers that predate the bitboards ---
+
+    @property
+    def my_frogs(self) -> Set[Coord]:
+        return {coord_of(sq) for sq in iter_squares(self.frogs[ME])}
+
+    @property
+    def enemy_frogs(self) -> Set[Coord]:
+        return {coord_of(sq) for sq in iter_squares(self.frogs[ENEMY])}
+
+    @property
+    def lilypads(self) -> Set[Coord]:
+        # Occupied squares still have a lily pad underneath
+        return {coord_of(sq) for sq in iter_squares(self.pads | self.occupied)}
+
+    @property
+    def occupied(self) -> int:
+        return self.frogs[ME] | self.frogs[ENEMY]
 
     def apply_move(self, coord: Coord, dirs: list[Direction]):
-        # Remove frog and its lilypad
-        self.my_frogs.remove(coord)
-        self.lilypads.discard(coord)
-        dest = self.follow_directions(coord, dirs)
-        self.my_frogs.add(dest)
+        self.move(ME, coord, dirs)
 
     def update_opponent(self, coord: Coord, dirs: list[Direction]):
-        self.enemy_frogs.remove(coord)
-        self.lilypads.discard(coord)
-        dest = self.follow_directions(coord, dirs)
-        self.enemy_frogs.add(dest)
-
-    def apply_grow(self):
-        for frog in list(self.my_frogs):
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    r, c = frog.r + dr, frog.c + dc
-                    if is_within_bounds(r, c):
-                        self.lilypads.add(Coord(r, c))
+        self.move(ENEMY, coord, dirs)
+
+    def move(self, side: int, coord: Coord, dirs: list[Direction]):
+        if not self.frogs[side] & (1 << square(coord.r, coord.c)):
+            raise KeyError(coord)
+        self._make_move(side, square(coord.r, coord.c), dirs)
+
+    def apply_grow(self, side: int = ME):
+        self._make_grow(side)
+
+    def make(self, action: Action) -> UndoToken:
+        """
+        Play `action` for the side to move, in place. The returned token
+        restores the previous position when passed to `unmake`.
+        """
+        side = self.to_move
+        match action:
+            case MoveAction(coord, _):
+                token = self._make_move(
+                    side, square(coord.r, coord.c), action.directions)
+            case GrowAction():
+                token = self._make_grow(side)
+            case _:
+                raise ValueError(f"Unknown action: {action}")
+        return token
+
+    def unmake(self, token: UndoToken):
+        """
+        Revert the `make` call that produced `token`. Tokens must be unmade in
+        the reverse order they were made.
+        """
+        side = token.side
+        if token.start < 0:
+            self.pads ^= token.grown
+        else:
+            dest = 1 << token.dest
+            self.frogs[side] ^= (1 << token.start) | dest
+            self.pads |= dest
+            self._track_rows(side, token.dest, token.start)
+        self.to_move = side
+        self.key = token.key
+
+    def _make_move(self, side: int, start: int, dirs) -> UndoToken:
+        # Remove frog and its lilypad
+        dest = self._destination(start, dirs)
+        token = UndoToken(side, start, dest, 0, self.key)
+        self.frogs[side] ^= (1 << start) | (1 << dest)
+        self.pads &= ~(1 << dest)
+        frog_keys = ZOBRIST_FROG[side]
+        self.key ^= frog_keys[start] ^ frog_keys[dest] ^ ZOBRIST_PAD[dest]
+        self._track_rows(side, start, dest)
+        self._pass_turn(side)
+        return token
+
+    def _track_rows(self, side: int, start: int, dest: int):
+        # Update the evaluation totals for a frog of `side` moving start->dest
+        goal_row = self.goal_rows[side]
+        from_row, to_row = start // BOARD_N, dest // BOARD_N
+        self.distance[side] += abs(to_row - goal_row) - abs(from_row - goal_row)
+        self.reached[side] += (to_row == goal_row) - (from_row == goal_row)
+
+    def _make_grow(self, side: int) -> UndoToken:
+        grown = self.grow_mask(side)
+        token = UndoToken(side, -1, -1, grown, self.key)
+        self.pads |= grown
+        for sq in iter_squares(grown):
+            self.key ^= ZOBRIST_PAD[sq]
+        self._pass_turn(side)
+        return token
+
+    def _pass_turn(self, side: int):
+        if self.to_move == side:
+            self.key ^= ZOBRIST_ENEMY_TO_MOVE
+        self.to_move = 1 - side
+
+    def grow_mask(self, side: int = ME) -> int:
+        """
+        Squares that would gain a lily pad if `side` played a grow action.
+        """
+        grown = 0
+        for sq in iter_squares(self.frogs[side]):
+            grown |= NEIGHBOURS[sq]
+        return grown & ~self.pads & ~self.occupied
 
     def follow_directions(self, start: Coord, dirs: list[Direction]) -> Coord:
-        current = start
+        return coord_of(self._destination(square(start.r, start.c), dirs))
+
+    def _destination(self, current: int, dirs) -> int:
+        # The moving frog is lifted off `current` before it hops
+        occupied = self.occupied & ~(1 << current)
         for d in dirs:
-            dr, dc = d.value
             # Determine if this hop is a jump (over another frog) or a step
-            mid = Coord(current.r + dr, current.c + dc)
-            if mid in self.my_frogs or mid in self.enemy_frogs:
-                step = 2
-            else:
-                step = 1
-            next_r = current.r + step * dr
-            next_c = current.c + step * dc
-
-            if not is_within_bounds(next_r, next_c):
-                raise ValueError(f"Out-of-bounds coordinate: {next_r}-{next_c}")
-
-            current = Coord(next_r, next_c)
+            nxt = STEP[d][current]
+            if nxt >= 0 and occupied >> nxt & 1:
+                jump = JUMP[d][current]
+                nxt = jump[1] if jump is not None else -1
+            if nxt < 0:
+                r, c = current // BOARD_N, current % BOARD_N
+                raise ValueError(
+                    f"Out-of-bounds coordinate: {r + 2 * d.r}-{c + 2 * d.c}")
+            current = nxt
 
         return current
+
+    def active_frogs(self, side: int) -> int:
+        """
+        Frogs of `side` that have not yet reached their goal row.
+        """
+        return self.frogs[side] & ~(ROW_MASK << (self.goal_rows[side] * BOARD_N))
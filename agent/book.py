@@ -0,0 +1,141 @@
+# Opening book: best moves for the first few turns, searched offline.
+#
+# Build (or extend) the book with self-play:
+#   python -m agent.book --games 50 --budget 2.0
+
+import argparse
+import random
+import struct
+from pathlib import Path
+
+from referee.game import PlayerColor, MoveAction, GrowAction, Direction
+from .utils.board_utils import COORDS, square
+
+BOOK_PATH = Path(__file__).with_name("book.bin")
+
+# Record: position key, origin square (GROW_SQUARE for a grow), number of
+# directions, then the directions packed 3 bits each, first hop lowest
+RECORD = struct.Struct("<QBBQ")
+GROW_SQUARE = 0xFF
+DIRECTIONS = list(Direction)
+# Mixed into the key of BLUE's positions so the two colours never collide
+BLUE_KEY = 0x9E3779B97F4A7C15
+
+
+def book_key(board) -> int:
+    if board.color == PlayerColor.BLUE:
+        return board.key ^ BLUE_KEY
+    return board.key
+
+
+def encode(action) -> tuple[int, int, int]:
+    if isinstance(action, GrowAction):
+        return GROW_SQUARE, 0, 0
+    packed = 0
+    for i, d in enumerate(action.directions):
+        packed |= DIRECTIONS.index(d) << (3 * i)
+    return square(action.coord.r, action.coord.c), len(action.directions), packed
+
+
+def decode(sq: int, count: int, packed: int):
+    if sq == GROW_SQUARE:
+        return GrowAction()
+    dirs = tuple(DIRECTIONS[packed >> (3 * i) & 7] for i in range(count))
+    return MoveAction(COORDS[sq], dirs)
+
+
+class OpeningBook:
+    """
+    Maps position keys (see `book_key`) to the move to play. The file is
+    only read on the first lookup; a missing file is an empty book.
+    """
+    def __init__(self, path: Path | None = BOOK_PATH):
+        self.path = path
+        self._moves: dict[int, tuple] | None = None
+
+    def _load(self):
+        self._moves = {}
+        if self.path is None or not self.path.exists():
+            return
+        data = self.path.read_bytes()
+        for key, sq, count, packed in RECORD.iter_unpack(data):
+            self._moves[key] = (sq, count, packed)
+
+    def lookup(self, board):
+        if self._moves is None:
+            self._load()
+        record = self._moves.get(book_key(board))
+        return decode(*record) if record is not None else None
+
+    def add(self, board, action):
+        if self._moves is None:
+            self._load()
+        self._moves[book_key(board)] = encode(action)
+
+    def save(self):
+        # Sorted by key so rebuilding an unchanged book gives the same file
+        with open(self.path, "wb") as f:
+            for key in sorted(self._moves):
+                f.write(RECORD.pack(key, *self._moves[key]))
+
+    def __len__(self) -> int:
+        if self._moves is None:
+            self._load()
+        return len(self._moves)
+
+
+def self_play(book: OpeningBook, budget: float, explore: float, rng: random.Random):
+    """
+    Play one game between two book-less agents up to the grow cutoff,
+    recording the searched move of every position not yet in the book.
+    With probability `explore` a random legal move is played instead, so
+    that later games reach new positions.
+    """
+    from .program import Agent
+    from .timeman import TimeManager
+
+    agents = {color: Agent(color) for color in PlayerColor}
+    for agent in agents.values():
+        agent.book = OpeningBook(None)
+        agent.clock = TimeManager(budget)
+
+    color = PlayerColor.RED
+    while any(a.turn < Agent.GROW_CUTOFF for a in agents.values()):
+        agent = agents[color]
+        action = book.lookup(agent.board)
+        if action is None:
+            action = agent.action()
+            book.add(agent.board, action)
+        else:
+            agent.turn += 1
+        if rng.random() < explore:
+            action = rng.choice(agent.generate_actions(agent.board, True)
+                                or [GrowAction()])
+
+        for a in agents.values():
+            a.update(color, action)
+        color = color.opponent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book.")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="search time per position (seconds)")
+    parser.add_argument("--explore", type=float, default=0.2,
+                        help="chance of playing a random move instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=BOOK_PATH)
+    args = parser.parse_args()
+
+    book = OpeningBook(args.output)
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    for game in range(args.games):
+        self_play(book, args.budget, args.explore, rng)
+        print(f"game {game + 1}/{args.games}: {len(book)} positions")
+    book.save()
+
+
+if __name__ == "__main__":
+    main()
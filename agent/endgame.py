@@ -0,0 +1,144 @@
+# Endgame solver: shortest way home for the last few frogs.
+
+import os
+import struct
+from pathlib import Path
+
+from referee.game import GrowAction
+from .board import ME, ENEMY
+from .book import book_key, encode, decode
+from .tt import LOWER
+
+# Solve once at most this many of our frogs are off the goal row
+ENDGAME_FROGS = 2
+# Longest solution searched for (our own moves)
+MAX_MOVES = 10
+# Nodes between clock checks
+POLL_NODES = 256
+
+CACHE_PATH = Path(__file__).with_name("endgame.bin")
+# Record: position key, solution length, then the first move as in the book
+RECORD = struct.Struct("<QBBBQ")
+
+
+class EndgameSolver:
+    """
+    Finds the fewest of our own moves that bring every frog to the goal row,
+    by iterative-deepening A* with one move per frog still to arrive as the
+    (admissible) heuristic.
+
+    This solves a relaxation of the real game: the enemy's frogs are frozen
+    where they stand, and frogs that have reached the goal row stay put. The
+    answer is exact for that one-player puzzle, and is re-solved each turn as
+    the enemy moves. Searches that fail to reach a depth are stored in the
+    transposition table as lower bounds. Solutions are looked up in a cache
+    file first; if it is `writable`, positions solved here are appended to
+    it so later games can play them without searching.
+    """
+    def __init__(self, movegen, tt, clock, path: Path | None = CACHE_PATH,
+                 writable: bool = False):
+        self.movegen = movegen
+        self.tt = tt
+        self.clock = clock
+        self.path = path
+        self.writable = writable
+        self.nodes = 0
+        self._solved: dict[int, tuple] | None = None
+        self._time_limit = 0.0
+        self.timed_out = False
+
+    def applies(self, board) -> bool:
+        return board.active_frogs(ME).bit_count() <= ENDGAME_FROGS
+
+    def solve(self, board, max_moves: int = MAX_MOVES, time_limit: float | None = None):
+        """
+        (moves, first action) of a shortest solution from `board` (with us
+        to move), or None if there is none within `max_moves` or the clock
+        ran out first. `time_limit` defaults to the clock's soft budget.
+        """
+        if self._solved is None:
+            self._load()
+        key = book_key(board)
+        cached = self._solved.get(key)
+        if cached is not None and cached[0] <= max_moves:
+            moves, *record = cached
+            action = decode(*record)
+            if self.movegen.is_legal(board, ME, action):
+                return moves, action
+
+        self._time_limit = self.clock.soft if time_limit is None else time_limit
+        self.timed_out = False
+        for bound in range(board.active_frogs(ME).bit_count(), max_moves + 1):
+            action = self._search(board, bound)
+            if self.timed_out:
+                break
+            if action is not None:
+                self._remember(key, bound, action)
+                return bound, action
+        return None
+
+    def _search(self, board, remaining: int):
+        """
+        First action of a solution in at most `remaining` moves, or None.
+        """
+        self.nodes += 1
+        if not self.nodes % POLL_NODES and self.clock.elapsed() >= self._time_limit:
+            self.timed_out = True
+        if self.timed_out:
+            return None
+
+        active = board.active_frogs(ME).bit_count()
+        if active > remaining:
+            return None
+        entry = self.tt.probe(board.key)
+        if entry is not None and entry[1] >= remaining:
+            return None
+
+        actions = self.movegen.actions(board, ME)
+        if not any(isinstance(a, GrowAction) for a in actions):
+            actions.append(GrowAction())
+        for action in actions:
+            undo = board.make(action)
+            board._pass_turn(ENEMY)  # Enemy frogs stay frozen
+            if not board.active_frogs(ME):
+                found = True
+            else:
+                found = remaining > 1 and self._search(board, remaining - 1) is not None
+            board.unmake(undo)
+            if found:
+                return action
+
+        # Needs more than `remaining` moves (unless the search was cut short)
+        if not self.timed_out:
+            self.tt.store(board.key, remaining, LOWER, remaining + 1, None)
+        return None
+
+    def _load(self):
+        self._solved = {}
+        if self.path is None:
+            return
+        try:
+            data = self.path.read_bytes()
+            whole = len(data) // RECORD.size * RECORD.size
+            if whole != len(data) and self.writable:
+                # A write was cut short: drop the partial record, so that
+                # records appended from now on stay aligned
+                os.truncate(self.path, whole)
+            for key, moves, *record in RECORD.iter_unpack(data[:whole]):
+                self._solved[key] = (moves, *record)
+        except (OSError, struct.error):
+            self._solved = {}  # Missing or unreadable: start a new cache
+
+    def _remember(self, key: int, moves: int, action):
+        self._solved[key] = (moves, *encode(action))
+        if self.path is None or not self.writable:
+            return
+        try:
+            # One unbuffered write per record, so a record is never split
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, RECORD.pack(key, moves, *encode(action)))
+            finally:
+                os.close(fd)
+        except OSError:
+            pass  # The cache is an optimisation; a read-only install is fine
@@ -0,0 +1,145 @@
+# Vectorised evaluation and playout kernel over batches of bitboards.
+#
+# A batch holds N positions as parallel uint64 arrays (one bitboard per
+# position). Viewed as bytes, each uint64 is (N, 8) rows, so per-row frog
+# counts are a popcount table lookup away. NumPy is optional: callers check
+# `AVAILABLE` and keep their scalar code path when it is missing.
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from referee.game import Direction, BOARD_N
+from .utils.board_utils import FULL_MASK, SHIFTS, REVERSE
+
+AVAILABLE = np is not None
+
+if AVAILABLE:
+    POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    ROWS = np.arange(BOARD_N)
+    _FULL = np.uint64(FULL_MASK)
+
+
+def as_batch(masks) -> "np.ndarray":
+    """
+    Bitboards (any iterable of ints, or an array) as a little-endian uint64
+    array, so that byte i of each element is row i.
+    """
+    return np.asarray(masks, dtype="<u8")
+
+
+def row_counts(masks) -> "np.ndarray":
+    """
+    (N, 8) number of set bits on each row of each bitboard.
+    """
+    masks = as_batch(masks)
+    return POPCOUNT[masks.view(np.uint8).reshape(-1, BOARD_N)]
+
+
+def popcount(masks) -> "np.ndarray":
+    return row_counts(masks).sum(axis=1, dtype=np.int64)
+
+
+def evaluate_batch(mine, theirs, goal_rows: tuple[int, int]) -> "np.ndarray":
+    """
+    `agent.eval.evaluate` for N positions at once: `mine[i]` and `theirs[i]`
+    are our and the enemy's frogs in position i.
+    """
+    my_rows, their_rows = row_counts(mine), row_counts(theirs)
+    goal, enemy_goal = goal_rows
+    reach = my_rows[:, goal].astype(np.int64) - their_rows[:, enemy_goal]
+    distance = my_rows @ np.abs(ROWS - goal)
+    return (100 * reach - distance).astype(np.float64)
+
+
+def shift_batch(masks, direction: Direction) -> "np.ndarray":
+    """
+    `utils.board_utils.shift` applied to every bitboard of a batch.
+    """
+    offset, source = SHIFTS[direction]
+    masks = as_batch(masks) & np.uint64(source)
+    if offset > 0:
+        return (masks << np.uint64(offset)) & _FULL
+    return masks >> np.uint64(-offset)
+
+
+def step_targets(frogs, pads, directions) -> "np.ndarray":
+    """
+    Batched legal-step generator: (N, len(directions)) masks of the squares
+    the frogs of each position can step to in each direction.
+    """
+    frogs, pads = as_batch(frogs), as_batch(pads)
+    return np.stack([shift_batch(frogs, d) & pads for d in directions], axis=1)
+
+
+def neighbours_batch(frogs) -> "np.ndarray":
+    grown = np.zeros_like(as_batch(frogs))
+    for d in Direction:
+        grown |= shift_batch(frogs, d)
+    return grown
+
+
+def nth_bit(masks, n) -> "np.ndarray":
+    """
+    Square index of the `n[i]`-th (0-based, lowest first) set bit of each
+    bitboard; the bitboards must have more than `n[i]` set bits.
+    """
+    bits = np.unpackbits(as_batch(masks).view(np.uint8).reshape(-1, BOARD_N),
+                         axis=1, bitorder="little")
+    return (np.cumsum(bits, axis=1) > np.asarray(n)[:, None]).argmax(axis=1)
+
+
+def playouts(frogs: tuple[int, int], pads: int, side: int,
+             goal_rows: tuple[int, int], forward: tuple, count: int,
+             plies: int, rng) -> float:
+    """
+    Play `count` random games in lockstep from one position, with the same
+    rules and scoring as `MCTSAgent.playouts`, and return side 0's total
+    score. `forward` holds each side's forward directions and `rng` is a
+    `numpy.random.Generator`.
+    """
+    frogs = [np.full(count, frogs[s], dtype="<u8") for s in (0, 1)]
+    pads = np.full(count, pads, dtype="<u8")
+    goals = [np.uint64(0xFF << (row * BOARD_N)) for row in goal_rows]
+    live = np.ones(count, dtype=bool)
+
+    for _ in range(plies):
+        live &= (frogs[0] & ~goals[0] != 0) & (frogs[1] & ~goals[1] != 0)
+        if not live.any():
+            break
+        active = frogs[side] & ~goals[side]
+        targets = step_targets(active, pads, forward[side])
+        counts = popcount(targets.reshape(-1)).reshape(targets.shape)
+        totals = counts.sum(axis=1)
+        stepping = live & (totals > 0)
+        growing = live & (totals == 0)
+
+        if stepping.any():
+            idx = np.flatnonzero(stepping)
+            pick = (rng.random(len(idx)) * totals[idx]).astype(np.int64)
+            ends = np.cumsum(counts[idx], axis=1)
+            d = (ends > pick[:, None]).argmax(axis=1)
+            pick -= ends[np.arange(len(idx)), d] - counts[idx, d]
+            dest = nth_bit(targets[idx, d], pick)
+            dest_bits = np.left_shift(np.uint64(1), dest.astype(np.uint64))
+            src_bits = np.zeros(len(idx), dtype="<u8")
+            for i, direction in enumerate(forward[side]):
+                chosen = d == i
+                src_bits[chosen] = shift_batch(dest_bits[chosen], REVERSE[direction])
+            frogs[side][idx] ^= src_bits | dest_bits
+            pads[idx] &= ~dest_bits
+
+        if growing.any():
+            occupied = frogs[0] | frogs[1]
+            grown = neighbours_batch(frogs[side]) & ~occupied
+            pads[growing] |= grown[growing]
+
+        side = 1 - side
+
+    home = [row_counts(frogs[s])[:, goal_rows[s]].astype(np.int64) for s in (0, 1)]
+    distance = [row_counts(frogs[s]) @ np.abs(ROWS - goal_rows[s]) for s in (0, 1)]
+    wins = np.where(home[0] != home[1], home[0] > home[1],
+                    np.where(distance[0] == distance[1], 0.5, distance[0] < distance[1]))
+    return float(wins.sum())
+
@@ -0,0 +1,232 @@
+# Monte-Carlo tree search agent, an alternative to the alpha-beta `Agent`.
+
+import math
+import os
+import random
+
+from referee.game import PlayerColor, Action, GrowAction, \
+    BOARD_N, MAX_TURNS
+from .board import Board, ME, ENEMY, FORWARD_DIRECTIONS
+from .movegen import MoveGenerator
+from .timeman import TimeManager
+from .stats import SearchStats
+from . import kernel
+from .utils.board_utils import ROW_MASK, NEIGHBOURS, REVERSE, shift, iter_squares
+
+
+class Node:
+    """
+    One position in the search tree. `side` is the side to move here, and
+    `wins` is credited to the side that moved into it (the parent's side).
+    """
+    __slots__ = ("action", "parent", "side", "children", "untried", "visits", "wins")
+
+    def __init__(self, action, parent, side: int):
+        self.action = action
+        self.parent = parent
+        self.side = side
+        self.children: dict = {}
+        self.untried: list | None = None  # generated on first visit
+        self.visits = 0
+        self.wins = 0.0
+
+    def select(self, exploration: float) -> "Node":
+        log_n = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_n / c.visits)
+        )
+
+
+class MCTSAgent:
+    """
+    Agent variant that picks moves by UCT search with random playouts
+    (select with `agent:MCTSAgent` on the referee command line). The tree is
+    kept between turns: `update` descends into the subtree of each action
+    played, so the statistics gathered for it are reused.
+    """
+    EXPLORATION = 1.4  # UCT exploration constant
+    PLAYOUT_BATCH = 8  # playouts run from each expanded leaf
+    PLAYOUT_PLIES = 40  # playouts stop and are scored after this many plies
+    VECTORISED = False  # run each batch of playouts in lockstep with NumPy
+    VECTOR_BATCH = 256  # playouts per leaf when vectorised
+    STATS = os.environ.get("AGENT_STATS")  # file to append JSONL search stats to
+
+    def __init__(self, color: PlayerColor, **referee: dict):
+        self._color = color
+        self.board = Board(color)
+        self.board.initialize()
+        self.movegen = MoveGenerator()
+        self.clock = TimeManager()
+        self.root = Node(None, None, self.board.to_move)
+        self.turn = 0
+        self.plies = 0
+        self.rng = random.Random()
+        self.vectorised = self.VECTORISED and kernel.AVAILABLE
+        if self.vectorised:
+            self.np_rng = kernel.np.random.default_rng()
+        # Lockstep playouts only pay off in large batches
+        self.batch = self.VECTOR_BATCH if self.vectorised else self.PLAYOUT_BATCH
+        self.nodes = 0  # playouts run, for stats
+        self.stats = None
+        if self.STATS:
+            self.stats = SearchStats(self.STATS)
+            self.stats.instrument(self)
+
+        match color:
+            case PlayerColor.RED:
+                print("Testing: I am playing as RED")
+            case PlayerColor.BLUE:
+                print("Testing: I am playing as BLUE")
+
+    def action(self, **referee: dict) -> Action:
+        self.turn += 1
+        if self.stats is not None:
+            self.stats.begin_move(self.turn, self._color, self.nodes)
+        self.clock.allocate(referee.get("time_remaining"), self.plies)
+
+        actions = self._expand(self.root) + list(self.root.children)
+        if len(actions) == 1:
+            return self._played(actions[0], "forced")
+
+        iterations = 0
+        while not iterations or self.clock.elapsed() < self.clock.soft:
+            self.iterate()
+            iterations += 1
+
+        best = max(self.root.children.values(), key=lambda c: c.visits)
+        print(f"[DEBUG] Time used: {self.clock.elapsed():.2f}s, iterations: {iterations}, "
+              f"playouts: {self.root.visits}, selected: {best.action}")
+        return self._played(best.action, "search", iterations=iterations,
+                            playouts=self.root.visits)
+
+    def _played(self, action: Action, source: str, **extra) -> Action:
+        if self.stats is not None:
+            self.stats.end_move(self.nodes, source, **extra)
+        return action
+
+    def iterate(self):
+        """
+        One selection, expansion, (batched) simulation and backpropagation.
+        """
+        board = self.board
+        node = self.root
+        undo = []
+
+        # Selection: descend through fully expanded nodes
+        while node.untried is not None and not node.untried and node.children:
+            node = node.select(self.EXPLORATION)
+            undo.append(board.make(node.action))
+
+        # Expansion: add one untried child, unless the game is over here
+        if not self._winner(board):
+            untried = self._expand(node)
+            if untried:
+                action = untried.pop(self.rng.randrange(len(untried)))
+                undo.append(board.make(action))
+                child = Node(action, node, board.to_move)
+                node.children[action] = child
+                node = child
+
+        # Simulation: score for ME, summed over the batch
+        score = self.playouts(board, self.batch)
+        self.nodes += self.batch
+
+        for token in reversed(undo):
+            board.unmake(token)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += self.batch
+            if node.parent is not None:
+                mover = node.parent.side
+                node.wins += score if mover == ME else self.batch - score
+            node = node.parent
+
+    def _expand(self, node: Node) -> list:
+        # Generated once per node (at its position on `self.board`) and popped
+        # as children are added, so every child is tried before UCT applies
+        if node.untried is None:
+            node.untried = self.movegen.actions(self.board, node.side) or [GrowAction()]
+        return node.untried
+
+    def _winner(self, board) -> bool:
+        return not board.active_frogs(ME) or not board.active_frogs(ENEMY)
+
+    def playouts(self, board, count: int) -> float:
+        """
+        Play `count` random games from `board` on plain bitboards and return
+        our total score: 1 per win, 0.5 per draw. Playouts only make single
+        steps (forward ones when there are any, otherwise a grow); they are
+        cut off after `PLAYOUT_PLIES` plies and scored by frogs home, then by
+        distance to the goal.
+        """
+        forward = tuple(FORWARD_DIRECTIONS[c] for c in board.colors)
+        plies_left = min(self.PLAYOUT_PLIES, MAX_TURNS - self.plies)
+        if self.vectorised:
+            return kernel.playouts(tuple(board.frogs), board.pads, board.to_move,
+                                   board.goal_rows, forward, count, plies_left,
+                                   self.np_rng)
+
+        goals = tuple(ROW_MASK << (row * BOARD_N) for row in board.goal_rows)
+        randrange = self.rng.randrange
+        total = 0.0
+
+        for _ in range(count):
+            frogs = list(board.frogs)
+            pads = board.pads
+            side = board.to_move
+            for _ in range(plies_left):
+                if not frogs[ME] & ~goals[ME] or not frogs[ENEMY] & ~goals[ENEMY]:
+                    break
+                active = frogs[side] & ~goals[side]
+                moves = [(d, shift(active, d) & pads) for d in forward[side]]
+                options = sum(t.bit_count() for _, t in moves)
+                if options:
+                    pick = randrange(options)
+                    for d, targets in moves:
+                        n = targets.bit_count()
+                        if pick < n:
+                            break
+                        pick -= n
+                    for dest in iter_squares(targets):
+                        if not pick:
+                            break
+                        pick -= 1
+                    src = shift(1 << dest, REVERSE[d])
+                    frogs[side] ^= src | (1 << dest)
+                    pads &= ~(1 << dest)
+                else:
+                    occupied = frogs[ME] | frogs[ENEMY]
+                    for sq in iter_squares(frogs[side]):
+                        pads |= NEIGHBOURS[sq]
+                    pads &= ~occupied
+                side = 1 - side
+            total += _score(frogs, goals, board.goal_rows)
+        return total
+
+    def update(self, color: PlayerColor, action: Action, **referee: dict):
+        # Moves alternate, so `make` plays `action` for `color`
+        self.board.make(action)
+        self.plies += 1
+        # Keep the subtree of the action played, if it was searched
+        child = self.root.children.get(action)
+        if child is not None and child.side == self.board.to_move:
+            child.parent = None
+            child.action = None
+            self.root = child
+        else:
+            self.root = Node(None, None, self.board.to_move)
+
+
+def _score(frogs: list[int], goals: tuple[int, int], goal_rows: tuple[int, int]) -> float:
+    home = [(frogs[s] & goals[s]).bit_count() for s in (ME, ENEMY)]
+    if home[ME] != home[ENEMY]:
+        return 1.0 if home[ME] > home[ENEMY] else 0.0
+    distance = [0, 0]
+    for s in (ME, ENEMY):
+        for sq in iter_squares(frogs[s]):
+            distance[s] += abs(sq // BOARD_N - goal_rows[s])
+    if distance[ME] == distance[ENEMY]:
+        return 0.5
+    return 1.0 if distance[ME] < distance[ENEMY] else 0.0
@@ -0,0 +1,193 @@
+# Incrementally maintained legal move generation for the agent's search.
+
+from referee.game import PlayerColor, MoveAction, GrowAction, BOARD_N
+from .board import FORWARD_DIRECTIONS, LEGAL_TABLES
+from .utils.board_utils import COORDS, square, shift, iter_squares
+
+# Entries kept in the jump memo before it is cleared (see `jump_landings`)
+JUMP_MEMO_SIZE = 1 << 14
+
+
+class MoveGenerator:
+    """
+    Generates legal actions for either side of a `Board`, caching the step
+    and jump moves of every frog. Each cache entry remembers the region of
+    the board its moves were derived from (step targets, jumped-over cells
+    and landing cells) along with the contents of that region, so a frog is
+    only regenerated when a move or grow changed something it can see.
+    """
+    def __init__(self):
+        # (side, square) -> (region, occupied & region, pads & region, moves)
+        self._cache: dict[tuple[int, int], tuple] = {}
+
+    def frog_moves(self, board, side: int, sq: int) -> list[tuple]:
+        """
+        (progress, efficiency, action) for every move of the frog on `sq`.
+        """
+        occupied, pads = board.occupied, board.pads
+        entry = self._cache.get((side, sq))
+        if entry is not None:
+            region, occ_bits, pad_bits, moves = entry
+            if occupied & region == occ_bits and pads & region == pad_bits:
+                return moves
+
+        moves, region = _generate(board, side, sq)
+        self._cache[(side, sq)] = (region, occupied & region, pads & region, moves)
+        return moves
+
+    def actions(self, board, side: int) -> list:
+        """
+        All actions for `side`, in static order: moves making the most
+        progress towards the goal row first, with frogs furthest from their
+        goal breaking ties. A grow is included (first) only when it enables
+        more forward moves than the best move makes progress.
+        """
+        # Low squares first when moving down the board (RED), high squares
+        # first when moving up
+        backwards = board.colors[side] == PlayerColor.BLUE
+        entries = []
+        for sq in sorted(iter_squares(board.active_frogs(side)), reverse=backwards):
+            entries.extend(self.frog_moves(board, side, sq))
+        entries.sort(key=lambda e: (e[0], e[1]), reverse=True)
+        actions = [e[2] for e in entries]
+
+        benefit = grow_benefit(board, side)
+        if benefit > 0 and (not entries or benefit > entries[0][0]):
+            actions.insert(0, GrowAction())
+        return actions
+
+    def noisy_actions(self, board, side: int) -> list:
+        """
+        The moves of `side` that swing the evaluation most: jumps forward
+        (two or more rows of progress) and moves that reach the goal row.
+        Largest progress first.
+        """
+        goal_row = board.goal_rows[side]
+        entries = []
+        for sq in iter_squares(board.active_frogs(side)):
+            distance = abs(sq // BOARD_N - goal_row)
+            for entry in self.frog_moves(board, side, sq):
+                progress = entry[0]
+                if progress >= 2 or (progress and progress == distance):
+                    entries.append(entry)
+        entries.sort(key=lambda e: e[0], reverse=True)
+        return [e[2] for e in entries]
+
+    def is_legal(self, board, side: int, action) -> bool:
+        """
+        Whether `action` (e.g. a transposition-table or killer move taken from
+        another node) can be played by `side` in the current position.
+        """
+        if isinstance(action, GrowAction):
+            return True
+        sq = square(action.coord.r, action.coord.c)
+        if not board.active_frogs(side) & (1 << sq):
+            return False
+        return any(a == action for _, _, a in self.frog_moves(board, side, sq))
+
+
+def _generate(board, side: int, sq: int) -> tuple[list[tuple], int]:
+    # Steps first (forward, then sideways), then jump sequences
+    tables = LEGAL_TABLES[board.colors[side]]
+    occupied, pads = board.occupied, board.pads
+    coord = COORDS[sq]
+    row = sq // BOARD_N
+    region = 0
+    moves = []
+
+    for _, path, steps, _ in tables:
+        target = steps[sq]
+        if target < 0:
+            continue
+        region |= 1 << target
+        if pads >> target & 1:
+            moves.append(_entry(coord, row, target, path))
+
+    # A jump search examines the jumps out of the start and every landing
+    color = board.colors[side]
+    jump_region = JUMP_REGION[color]
+    region |= jump_region[sq]
+    for land, path in jump_landings(color, sq, occupied, pads):
+        region |= jump_region[land]
+        moves.append(_entry(coord, row, land, path))
+    return moves, region
+
+
+# (colour, square, occupied, pads) -> completed `jump_landings` results
+_jump_memo: dict[tuple, list[tuple]] = {}
+
+# Mask of the jumped-over and landing cells of every jump out of a square
+JUMP_REGION = {
+    color: [
+        sum((1 << jumps[sq][0]) | (1 << jumps[sq][1])
+            for _, _, _, jumps in tables if jumps[sq] is not None)
+        for sq in range(BOARD_N * BOARD_N)
+    ]
+    for color, tables in LEGAL_TABLES.items()
+}
+
+
+def jump_landings(color, sq: int, occupied: int, pads: int):
+    """
+    Lazily yield (landing square, path) for every square the frog on `sq`
+    can reach by a sequence of jumps, each landing square once. Landings are
+    found breadth first, so each comes with a shortest path (the first found
+    in direction order); chains that only differ on the way to the same
+    square are dropped, as they lead to the same position.
+
+    The frog itself still counts as an obstacle while it is mid-jump. Once
+    exhausted, the result is memoised per (colour, square, occupancy, pads),
+    so repeated positions in the search skip the traversal.
+    """
+    memo_key = (color, sq, occupied, pads)
+    landings = _jump_memo.get(memo_key)
+    if landings is not None:
+        yield from landings
+        return
+
+    tables = LEGAL_TABLES[color]
+    landings = []
+    visited = 1 << sq
+    frontier = [(sq, ())]
+    while frontier:
+        next_frontier = []
+        for current, path in frontier:
+            for d, _, _, jumps in tables:
+                jump = jumps[current]
+                if jump is None:
+                    continue
+                over, land = jump
+                if occupied >> over & 1 and pads >> land & 1 and not visited >> land & 1:
+                    visited |= 1 << land
+                    landing = (land, path + (d,))
+                    landings.append(landing)
+                    next_frontier.append(landing)
+                    yield landing
+        frontier = next_frontier
+
+    if len(_jump_memo) >= JUMP_MEMO_SIZE:
+        _jump_memo.clear()
+    _jump_memo[memo_key] = landings
+
+
+def _entry(coord, row: int, dest: int, path: tuple) -> tuple:
+    progress = abs(dest // BOARD_N - row)
+    if progress == 0:
+        efficiency = -1  # Penalize stagnation
+    elif len(path) == 1:
+        efficiency = 1  # Prefer single vertical and diagonal moves
+    else:
+        efficiency = 0
+    return (progress, efficiency, MoveAction(coord, path))
+
+
+def grow_benefit(board, side: int) -> int:
+    """
+    Number of new forward moves a grow action by `side` would enable.
+    """
+    grown = board.grow_mask(side)
+    frogs = board.active_frogs(side)
+    benefit = 0
+    for direction in FORWARD_DIRECTIONS[board.colors[side]]:
+        benefit += (shift(frogs, direction) & grown).bit_count()
+    return benefit
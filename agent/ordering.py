@@ -0,0 +1,67 @@
+# Move ordering heuristics for the agent's alpha-beta search.
+
+KILLER_SLOTS = 2
+MAX_PLY = 64
+
+
+class MoveOrderer:
+    """
+    Orders the children of a search node without simulating any of them: the
+    transposition-table (principal variation) move first, then the killer
+    moves that caused a cutoff at the same ply, then everything else by its
+    history heuristic score. Ties keep the move generator's own order.
+    """
+    def __init__(self):
+        self.killers: list[list] = [[] for _ in range(MAX_PLY)]
+        # One history table per side (indexed by ME/ENEMY), keyed by action
+        self.history: tuple[dict, dict] = ({}, {})
+
+    def staged(self, movegen, board, side: int, ply: int, tt_move=None):
+        """
+        Lazily yield the children of a node in the order described above.
+        The transposition-table and killer moves are only checked for
+        legality, so when one of them causes a cutoff the full move list is
+        never generated.
+        """
+        tried = []
+        killers = self.killers[ply] if ply < MAX_PLY else []
+        for action in (tt_move, *killers):
+            if action is None or action in tried:
+                continue
+            if movegen.is_legal(board, side, action):
+                tried.append(action)
+                yield action
+
+        history = self.history[side]
+        for action in sorted(
+            movegen.actions(board, side),
+            key=lambda a: history.get(a, 0),
+            reverse=True
+        ):
+            if action not in tried:
+                yield action
+
+    def record_cutoff(self, action, side: int, ply: int, depth: int):
+        """
+        Credit `action` with a beta cutoff found `depth` plies from the leaves.
+        """
+        history = self.history[side]
+        history[action] = history.get(action, 0) + depth * depth
+
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if action not in killers:
+                killers.insert(0, action)
+                del killers[KILLER_SLOTS:]
+
+    def new_search(self):
+        """
+        Prepare for the next move: killers refer to plies of the previous
+        search, so drop them, and age the history so recent cutoffs dominate.
+        """
+        self.killers = [[] for _ in range(MAX_PLY)]
+        for history in self.history:
+            for action in list(history):
+                history[action] //= 2
+                if not history[action]:
+                    del history[action]
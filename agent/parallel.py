@@ -0,0 +1,171 @@
+# Parallel root search: the root moves of each search are split across a pool
+# of worker processes, each running the ordinary alpha-beta search.
+#
+# Benchmark (wall-clock time and throughput per move, serial vs split):
+#
+#   python -c "from agent.parallel import bench; bench(budget=1.0, workers=3)"
+
+import os
+import sys
+import time
+import random
+import weakref
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+
+# Leeway (seconds) given to workers to report back after their time limit
+RESULT_GRACE = 0.25
+
+# Searcher owned by each worker process (see `_init_worker`)
+_worker = None
+
+
+def available_cores() -> int:
+    """
+    Cores this process may run on (which may be fewer than the machine has).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _init_worker(color, tt_mb: float):
+    global _worker
+    # stdout may be the referee's data pipe; keep worker output off it
+    sys.stdout = sys.stderr
+    from .program import Agent
+    from .tt import TranspositionTable
+    _worker = Agent(color)
+    _worker.tt = TranspositionTable(tt_mb)
+
+
+def _warm_up(_) -> bool:
+    return _worker is not None
+
+
+def _search(board, actions, time_limit: float, width: int):
+    start_cpu, start_nodes = time.process_time(), _worker.nodes
+    _worker.board = board
+    _worker.clock.fixed(time_limit)
+    completed = _worker.iterative_deepening(actions, width)
+    return completed, time.process_time() - start_cpu, _worker.nodes - start_nodes
+
+
+class RootSplitter:
+    """
+    Owns a pool of worker processes, each holding its own searcher and
+    transposition table that persist across turns. `search` deals the root
+    moves out round-robin (so every worker gets a share of the well-ordered
+    moves) and merges the workers' results at the deepest depth they all
+    completed. The pool is shut down by `shutdown`, or once the splitter is
+    garbage collected (e.g. when a warm process resets its agent).
+    """
+    def __init__(self, color, workers: int, tt_mb: float):
+        self.workers = workers
+        self.cpu_used = 0.0
+        self.nodes = 0
+        # Fresh interpreters rather than forks: the referee replaces our
+        # stdin/stdout with guards that forked children cannot clean up
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(color, tt_mb),
+        )
+        # Workers are idle between searches, so waiting for them is quick
+        self._finalizer = weakref.finalize(
+            self, self._pool.shutdown, wait=True, cancel_futures=True)
+        # Start every process now rather than on the first (timed) search
+        list(self._pool.map(_warm_up, range(workers)))
+
+    def search(self, board, actions, time_limit: float) -> list[tuple]:
+        """
+        Same contract as `Agent.iterative_deepening`, with `time_limit` CPU
+        seconds for each worker: (depth, score, action) for every depth
+        completed across all root moves.
+        """
+        chunks = [actions[i::self.workers] for i in range(self.workers)]
+        futures = [
+            self._pool.submit(_search, board, chunk, time_limit, len(actions))
+            for chunk in chunks if chunk
+        ]
+        # Workers stop on their own CPU clocks; allow for them sharing cores
+        done, late = wait(futures, timeout=time_limit * len(futures) + RESULT_GRACE)
+        for future in done:
+            self._charge(future)
+        for future in late:
+            future.add_done_callback(self._charge)
+
+        results = []
+        for future in done:
+            if future.exception() is not None:
+                continue
+            completed = future.result()[0]
+            if completed:
+                results.append({depth: (score, act) for depth, score, act in completed})
+        if len(results) < len(futures):
+            return []  # Some root moves went unsearched
+
+        merged = []
+        for depth in sorted(set.intersection(*(set(r) for r in results))):
+            score, act = max((r[depth] for r in results), key=lambda e: e[0])
+            merged.append((depth, score, act))
+        return merged
+
+    def _charge(self, future):
+        # Late workers are charged when they report back, after `search`
+        if not future.cancelled() and future.exception() is None:
+            _, cpu, nodes = future.result()
+            self.cpu_used += cpu
+            self.nodes += nodes
+
+    def shutdown(self):
+        self._finalizer()
+
+
+def bench(budget: float = 1.0, workers: int = 2, positions: int = 8):
+    """
+    Search `positions` random midgame positions serially with `budget` CPU
+    seconds, then split across `workers` with `budget / workers` each (the
+    same total CPU, as in `Agent.action`), and compare wall-clock times.
+    """
+    from referee.game import PlayerColor
+    from .program import Agent
+    from .board import ME
+
+    print(f"{available_cores()} cores available, {workers} workers, "
+          f"{budget}s CPU per move")
+    splitter = RootSplitter(PlayerColor.RED, workers, Agent.TT_MB / workers)
+    totals = {"serial": [0.0, 0, 0], "split": [0.0, 0, 0]}  # wall, nodes, depth
+    for seed in range(positions):
+        rng = random.Random(seed)
+        agent = Agent(PlayerColor.RED)
+        for _ in range(12 + 2 * seed):
+            side = agent.board.to_move
+            agent.board.make(rng.choice(agent.movegen.actions(agent.board, side)))
+        if agent.board.to_move != ME:
+            agent.board.make(rng.choice(agent.movegen.actions(agent.board, 1 - ME)))
+        actions = agent.movegen.actions(agent.board, ME)
+
+        start, nodes = time.perf_counter(), agent.nodes
+        agent.clock.fixed(budget)
+        completed = agent.iterative_deepening(list(actions))
+        runs = {"serial": (time.perf_counter() - start, agent.nodes - nodes, completed)}
+
+        start, nodes = time.perf_counter(), splitter.nodes
+        completed = splitter.search(agent.board, list(actions), budget / workers)
+        runs["split"] = (time.perf_counter() - start, splitter.nodes - nodes, completed)
+
+        for name, (wall, searched, completed) in runs.items():
+            depth = completed[-1][0] if completed else 0
+            for i, value in enumerate((wall, searched, depth)):
+                totals[name][i] += value
+    splitter.shutdown()
+
+    rates = {}
+    for name, (wall, searched, depth) in totals.items():
+        rates[name] = searched / wall
+        print(f"{name}: {wall / positions:.2f}s per move, {rates[name]:.0f} nodes/s, "
+              f"mean depth {depth / positions:.2f}")
+    print(f"wall-clock speedup {totals['serial'][0] / totals['split'][0]:.2f}x, "
+          f"throughput {rates['split'] / rates['serial']:.2f}x")
@@ -3,28 +3,79 @@
 # COMP30024 Artificial Intelligence, Semester 1 2025
 # Project Part B: Game Playing Agent
 
-from referee.game import PlayerColor, Coord, Direction, Action, MoveAction, GrowAction
-from .board import Board
+from referee.game import PlayerColor, Action, MoveAction, GrowAction, MAX_TURNS
+from .board import Board, ME, ENEMY
 from .eval import evaluate
-from .utils.board_utils import is_within_bounds
-
+from .tt import TranspositionTable, EXACT, LOWER, UPPER
+from .ordering import MoveOrderer, MAX_PLY as MAX_DEPTH
+from .movegen import MoveGenerator
+from .parallel import RootSplitter, available_cores
+from .timeman import TimeManager
+from . import kernel
+from .stats import SearchStats
+from .book import OpeningBook, BOOK_PATH
+from .endgame import EndgameSolver, CACHE_PATH, MAX_MOVES
+
+import os
+from pathlib import Path
 import random
 import math
-import copy
-import time
 
 class Agent:
     GROW_CUTOFF = 8  # after 8 turns, never Grow again
+    TT_MB = 64  # transposition table memory cap (MB)
+    TT_SPACE_SHARE = 0.4  # never use more than this share of the space limit
+    WORKERS = 0  # root-splitting worker processes (0: search in-process)
+    POLL_NODES = 1024  # nodes searched between clock checks
+    BATCH_LEAVES = False  # evaluate the children of depth-1 nodes with NumPy
+    QS_PLIES = 4  # quiescence search depth beyond the horizon (0: off)
+    QS_NODES = 64  # quiescence nodes allowed per horizon node
+    STATS = os.environ.get("AGENT_STATS")  # file to append JSONL search stats to
+    BOOK = BOOK_PATH  # opening book for the first GROW_CUTOFF turns (None: off)
+    ENDGAME_CACHE = CACHE_PATH  # solved endgame positions, read-only (None: off)
+    # A cache file to read and also record new solutions in, instead
+    ENDGAME_RECORD = os.environ.get("AGENT_ENDGAME_CACHE")
+    ENDGAME_SHARE = 0.5  # share of the move's budget the endgame solver may use
 
     def __init__(self, color: PlayerColor, **referee: dict):
         self._color = color
         self.board = Board(color)
         self.board.initialize()
-        # --- inject both goal rows so evaluate() won't crash ---
-        # our goal (where our frogs want to reach)
-        self.board.goal_row = 7 if color == PlayerColor.RED else 0
-        # opponent’s goal
-        self.board.enemy_goal_row = 0 if color == PlayerColor.RED else 7
+
+        tt_mb = self.TT_MB
+        if referee.get("space_limit"):
+            tt_mb = min(tt_mb, referee["space_limit"] * self.TT_SPACE_SHARE)
+        if referee.get("space_remaining"):
+            tt_mb = min(tt_mb, referee["space_remaining"] * self.TT_SPACE_SHARE)
+        self.tt = TranspositionTable(tt_mb)
+        # Workers are started (and warmed up) once, then reused every turn.
+        # Their tables share the same memory budget as our own.
+        self.splitter = None
+        if self.WORKERS > 0:
+            self.splitter = RootSplitter(color, self.WORKERS, tt_mb / self.WORKERS)
+        self.ordering = MoveOrderer()
+        self.movegen = MoveGenerator()
+        self.clock = TimeManager()
+        self.book = OpeningBook(self.BOOK)
+        # The solver's table holds bounds of a different search, so it gets
+        # its own (small) table rather than sharing `self.tt`. Only a cache
+        # named explicitly is written to, never the one in the package.
+        record = self.ENDGAME_RECORD
+        self.endgame = EndgameSolver(
+            self.movegen, TranspositionTable(tt_mb / 8), self.clock,
+            Path(record) if record else self.ENDGAME_CACHE, writable=bool(record))
+        self.nodes = 0
+        self.next_poll = self.POLL_NODES  # node count of the next clock check
+        self.batch_leaves = self.BATCH_LEAVES and kernel.AVAILABLE
+        self.qs_left = 0
+        # Static evaluation; an attribute so that stats can time it
+        self.evaluate = evaluate
+        self.stats = None
+        if self.STATS:
+            self.stats = SearchStats(self.STATS)
+            self.stats.instrument(self)
+        self.root_depth = 0
+        self.timed_out = False
 
         self.turn = 0
 
@@ -37,204 +88,310 @@ class Agent:
     def action(self, **referee: dict) -> Action:
         self.turn += 1
         current_board = self.board
+        if self.stats is not None:
+            self.stats.begin_move(self.turn, self._color, self.nodes, self.tt)
+
+        # 0) opening book
+        if self.turn <= Agent.GROW_CUTOFF:
+            book_move = self.book.lookup(current_board)
+            if book_move is not None and self.movegen.is_legal(current_board, ME, book_move):
+                return self._played(book_move, "book")
 
         # 1) generate & prune actions
         actions = self.generate_actions(current_board, True)
         
         # Dynamically decide whether to use GrowAction
         if not actions or (self.turn <= Agent.GROW_CUTOFF and isinstance(actions[0], GrowAction)):
-            return GrowAction()
+            return self._played(GrowAction(), "grow" if actions else "forced")
+        if self.turn > Agent.GROW_CUTOFF:
+            actions = [a for a in actions if not isinstance(a, GrowAction)] \
+                or [GrowAction()]
+
+        # keep jumps first for the first pass; later passes are ordered by
+        # the previous iteration's scores, principal variation first
+        actions.sort(
+            key=lambda a: (
+                isinstance(a, MoveAction),
+                len(a.directions) if isinstance(a, MoveAction) else 0
+            ),
+            reverse=True
+        )
+
+        # Forced move: nothing to search
+        if len(actions) == 1:
+            return self._played(actions[0], "forced")
 
         # 2) iterative deepening with α–β
-        time_limit = min(referee.get("time_remaining", 1.0), 1.0)
-        start_time = time.time()
+        time_remaining = referee.get("time_remaining")
+        if self.splitter is not None and time_remaining is not None:
+            # Worker CPU time is not seen by the referee, so charge it here
+            time_remaining -= self.splitter.cpu_used
+        plies_played = 2 * (self.turn - 1) + (self._color == PlayerColor.BLUE)
+        self.clock.allocate(time_remaining, plies_played,
+                            self.volatility(current_board, actions))
+
+        # 3) few frogs left: solve the race home outright if it is short
+        if self.endgame.applies(current_board):
+            solved = self.endgame.solve(
+                current_board,
+                max_moves=min(MAX_MOVES, (MAX_TURNS - plies_played + 1) // 2),
+                time_limit=self.clock.soft * self.ENDGAME_SHARE)
+            if solved is not None:
+                moves, best_action = solved
+                print(f"[DEBUG] Time used: {self.clock.elapsed():.2f}s, solved in {moves} moves, selected: {best_action}")
+                return self._played(best_action, "endgame", moves=moves)
+
+        completed = None
+        if self.splitter is not None:
+            # The move's CPU budget is shared between the workers, so it is
+            # done in a fraction of the wall-clock time with a core each
+            nodes = self.splitter.nodes
+            completed = self.splitter.search(
+                self.board, actions, self.clock.soft / self.splitter.workers)
+            self.nodes += self.splitter.nodes - nodes
+        if not completed:
+            # No workers, or they failed to report: search here instead
+            completed = self.iterative_deepening(actions)
+
+        best_action = completed[-1][2] if completed else actions[0]
+        depth = completed[-1][0] if completed else 0
+        print(f"[DEBUG] Time used: {self.clock.elapsed():.2f}s, depth reached: {depth}, selected: {best_action}")
+        return self._played(best_action, "search", depth=depth)
+
+    def _played(self, action: Action, source: str, **extra) -> Action:
+        # Every move ends its stats record, however it was chosen
+        if self.stats is not None:
+            self.stats.end_move(self.nodes, source, **extra)
+        return action
+
+    def volatility(self, board, actions) -> float:
+        """
+        Share of the root moves that are jumps; jump races swing the
+        evaluation most between search depths.
+        """
+        jumps = 0
+        for a in actions:
+            if isinstance(a, MoveAction):
+                dest = board.follow_directions(a.coord, a.directions)
+                if max(abs(dest.r - a.coord.r), abs(dest.c - a.coord.c)) > 1:
+                    jumps += 1
+        return jumps / len(actions)
+
+    def iterative_deepening(self, actions, width=None):
+        """
+        Search the root `actions` to increasing depths until `self.clock`
+        says to stop. Returns (depth, score, best action) for every completed
+        depth. `width` is the total number of root moves, for callers that
+        only search a subset of them.
+        """
+        current_board = self.board
+        width = width or len(actions)
+        self.timed_out = False
+        self.ordering.new_search()
         best_action = actions[0]
+        completed = []
         depth = 1
 
-        while True:
+        while depth <= MAX_DEPTH:
             alpha, beta = -math.inf, math.inf
             new_best, new_best_score = None, -math.inf
-
-            # keep jumps first
-            actions.sort(
-                key=lambda a: (
-                    isinstance(a, MoveAction),
-                    len(a.directions) if isinstance(a, MoveAction) else 0
-                ),
-                reverse=True
-            )
+            scores = {}
+            self.root_depth = depth
 
             for act in actions:
-                if time.time() - start_time > time_limit - 0.05:
+                undo = current_board.make(act)
+                score = self.minimax(current_board, depth - 1, alpha, beta, False)
+                current_board.unmake(undo)
+                if self.timed_out:
                     break
-                nb = self.simulate_action(act, current_board, True)
-                score = self.minimax(nb, depth - 1, alpha, beta, False,
-                                     start_time, time_limit)
+                scores[act] = score
                 if score > new_best_score or (score == new_best_score and random.random() < 0.5):
                     new_best_score, new_best = score, act
                 alpha = max(alpha, score)
 
-            if time.time() - start_time > time_limit - 0.05:
+            if self.stats is not None:
+                self.stats.end_depth(depth, self.nodes, self.tt, not self.timed_out)
+            if self.timed_out:
                 break
+            best_changed = bool(completed) and new_best != best_action
             if new_best:
                 best_action = new_best
+                completed.append((depth, new_best_score, best_action))
+            if not self.clock.should_deepen(best_changed):
+                break
 
-            if len(actions) < 5:  # Few moves left, search deeper
+            if width < 5:  # Few moves left, search deeper
                 depth += 2
             else:
                 depth += 1
 
-            actions = self.generate_actions(current_board, True)
-            if self.turn > Agent.GROW_CUTOFF:
-                actions = [a for a in actions if not isinstance(a, GrowAction)]
-
-        print(f"[DEBUG] Time used: {time.time() - start_time:.2f}s, depth reached: {depth}, selected: {best_action}")
-        return best_action
+            actions.sort(
+                key=lambda a: (a == best_action, scores[a]),
+                reverse=True
+            )
 
-    def minimax(self, board, depth, alpha, beta, maximizing,
-                start_time=None, time_limit=None):
-        if start_time and time_limit and time.time() - start_time > time_limit - 0.05:
-            return evaluate(board)
+        return completed
+
+    def poll(self):
+        """
+        Check the clock once POLL_NODES nodes have been searched since the
+        last check. A threshold, not a modulo: quiescence and frontier nodes
+        advance `self.nodes` too, often by more than one at a time.
+        """
+        if self.nodes >= self.next_poll:
+            self.next_poll = self.nodes + self.POLL_NODES
+            if self.clock.out_of_time():
+                self.timed_out = True
+
+    def minimax(self, board, depth, alpha, beta, maximizing):
+        self.nodes += 1
+        self.poll()
+        if self.timed_out:
+            # Results below this point are unreliable; don't cache them
+            return self.evaluate(board)
         if depth == 0:
-            return evaluate(board)
-
-        actions = self.generate_actions(board, maximizing)
-        if not actions:
-            return evaluate(board)
-
-        actions.sort(key=lambda a: evaluate(self.simulate_action(a, board, maximizing)), reverse=True)
-
-        if maximizing:
-            max_eval = -math.inf
-            for act in actions:
-                nb = self.simulate_action(act, board, True)
-                sc = self.minimax(nb, depth - 1, alpha, beta, False, start_time, time_limit)
-                max_eval = max(max_eval, sc)
+            self.qs_left = self.QS_NODES
+            return self.quiesce(board, alpha, beta, maximizing, self.QS_PLIES)
+
+        alpha_orig, beta_orig = alpha, beta
+        entry = self.tt.probe(board.key)
+        if entry is not None and entry[1] >= depth:
+            _, _, bound, score, _ = entry
+            if bound == EXACT:
+                return score
+            if bound == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        side = ME if maximizing else ENEMY
+        ply = self.root_depth - depth
+        tt_move = entry[4] if entry is not None else None
+        actions = self.ordering.staged(self.movegen, board, side, ply, tt_move)
+
+        best_move = None
+        searched = 0
+        if depth == 1 and self.batch_leaves:
+            best, best_move = self.frontier(board, actions, maximizing)
+        elif maximizing:
+            best = -math.inf
+            for searched, act in enumerate(actions, 1):
+                undo = board.make(act)
+                sc = self.minimax(board, depth - 1, alpha, beta, False)
+                board.unmake(undo)
+                if sc > best:
+                    best, best_move = sc, act
                 alpha = max(alpha, sc)
                 if beta <= alpha:
+                    self.ordering.record_cutoff(act, side, ply, depth)
                     break
-            return max_eval
         else:
-            min_eval = math.inf
-            for act in actions:
-                nb = self.simulate_action(act, board, False)
-                sc = self.minimax(nb, depth - 1, alpha, beta, True, start_time, time_limit)
-                min_eval = min(min_eval, sc)
+            best = math.inf
+            for searched, act in enumerate(actions, 1):
+                undo = board.make(act)
+                sc = self.minimax(board, depth - 1, alpha, beta, True)
+                board.unmake(undo)
+                if sc < best:
+                    best, best_move = sc, act
                 beta = min(beta, sc)
                 if beta <= alpha:
+                    self.ordering.record_cutoff(act, side, ply, depth)
                     break
-            return min_eval
 
-    def generate_actions(self, board, for_maximizer):
-        frogs = board.my_frogs if for_maximizer else board.enemy_frogs
-        if (board.color == PlayerColor.RED and for_maximizer) or (board.color == PlayerColor.BLUE and not for_maximizer):
-            frogs = sorted(frogs, key=lambda f: f.r)  # Prioritize frogs further up
+        if best_move is None:
+            # No legal moves
+            return self.evaluate(board)
+        if self.stats is not None and searched:
+            self.stats.node(searched, beta <= alpha)
+
+        if not self.timed_out:
+            if best <= alpha_orig:
+                bound = UPPER
+            elif best >= beta_orig:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.tt.store(board.key, depth, bound, best, best_move)
+        return best
+
+    def quiesce(self, board, alpha, beta, maximizing, plies):
+        """
+        Extend the search past the horizon with noisy moves only (forward
+        jumps and goal-row arrivals) until the position is quiet, `plies`
+        run out or the node budget (`self.qs_left`) is spent. The side to
+        move may always stand pat on the static evaluation.
+        """
+        stand_pat = self.evaluate(board)
+        if plies == 0 or self.qs_left <= 0 or self.timed_out:
+            return stand_pat
+        if maximizing:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
         else:
-            frogs = sorted(frogs, key=lambda f: f.r, reverse=True) # Prioritize frogs further down
-
-        color = board.color if for_maximizer else (
-            PlayerColor.RED if board.color == PlayerColor.BLUE else PlayerColor.BLUE
-        )
-
-        valid_dirs = {
-            PlayerColor.RED: [Direction.Down, Direction.DownLeft, Direction.DownRight, Direction.Right, Direction.Left],
-            PlayerColor.BLUE: [Direction.Up, Direction.UpLeft, Direction.UpRight, Direction.Right, Direction.Left],
-        }
-
-        actions = []
-        for f in frogs:
-
-            # Skip frogs already in the goal row
-            if f.r == board.goal_row:
-                continue
-
-            # Check if the frog is on the second-to-last row
-            if f.r == (board.goal_row - 1 if board.goal_row > 0 else board.goal_row + 1):
-                # Evaluate grow-and-move strategy to reach the blank space
-                grow_and_move_option, grow_and_move_cost = evaluate_grow_and_move(self, f, board)
-                if grow_and_move_option:
-                    adjacent, blank = grow_and_move_option
-                    
-                    # Calculate the direction to move next to the blank space
-                    direction_tuple = (adjacent.r - f.r, adjacent.c - f.c)
-                    if direction_tuple in [d.value for d in Direction]:
-                        direction = Direction(direction_tuple)
-                        actions.append(MoveAction(f, [direction]))  # Move next to blank
-                        actions.append(GrowAction())  # Grow
-                        direction_to_blank = (blank.r - adjacent.r, blank.c - adjacent.c)
-                        if direction_to_blank in [d.value for d in Direction]:
-                            actions.append(MoveAction(adjacent, [Direction(direction_to_blank)]))  # Move into blank
-                    
-
-            # Generate regular move actions
-            for d in valid_dirs[color]:
-                if self.is_legal_single_step(board, f, d):
-                    actions.append(MoveAction(f, [d]))
-            all_f = board.my_frogs | board.enemy_frogs
-            for path in self.find_jump_paths(board, f, valid_dirs[color], all_f):
-                actions.append(MoveAction(f, path))
-
-        actions.sort(
-            key=lambda a: (
-                isinstance(a, MoveAction),
-                evaluate_move_progress(self, a, board),  # Prioritize moves with better progress
-                evaluate_move_efficiency(self, a)  # Penalize inefficient moves
-            ),
-            reverse=True
-        )
-
-        # Evaluate the GrowAction
-        grow_benefit = evaluate_grow_action(self, board)
-
-        # If GrowAction is more beneficial than the best MoveAction, prioritize it
-        if grow_benefit > 0 and (not actions or grow_benefit > evaluate_move_progress(self, actions[0], board)):
-            actions.insert(0, GrowAction())
-
-        return actions
-
-    def find_jump_paths(self, board, start, directions, all_frogs):
-        results = []
-        def dfs(cur, path, seen):
-            for d in directions:
-                dr, dc = d.value
-                or_, oc = cur.r + dr, cur.c + dc
-                lr, lc = cur.r + 2*dr, cur.c + 2*dc
-                if not (is_within_bounds(or_, oc) and is_within_bounds(lr, lc)):
-                    continue
-                over, land = Coord(or_, oc), Coord(lr, lc)
-                if (over in all_frogs and land in board.lilypads
-                        and land not in board.my_frogs
-                        and land not in board.enemy_frogs
-                        and land not in seen):
-                    newp = path + [d]
-                    results.append(newp)
-                    seen.add(land)
-                    dfs(land, newp, seen)
-                    seen.remove(land)
-        dfs(start, [], set())
-        return results
-
-    def simulate_action(self, action, board, for_maximizer):
-        try:
-            nb = copy.deepcopy(board)
-            if isinstance(action, MoveAction):
-                if for_maximizer:
-                    nb.apply_move(action.coord, action.directions)
-                else:
-                    nb.update_opponent(action.coord, action.directions)
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+
+        side = ME if maximizing else ENEMY
+        best = stand_pat
+        for act in self.movegen.noisy_actions(board, side):
+            self.qs_left -= 1
+            self.nodes += 1
+            self.poll()
+            if self.timed_out:
+                break
+            undo = board.make(act)
+            sc = self.quiesce(board, alpha, beta, not maximizing, plies - 1)
+            board.unmake(undo)
+            if maximizing:
+                best = max(best, sc)
+                alpha = max(alpha, sc)
             else:
-                nb.apply_grow()
-            return nb
-        except:
-            return board
-
-    def is_legal_single_step(self, board, start: Coord, direction: Direction) -> bool:
-        dr, dc = direction.value
-        rr, cc = start.r + dr, start.c + dc
-        if not is_within_bounds(rr, cc):
-            return False
-        dest = Coord(rr, cc)
-        return dest in board.lilypads and dest not in board.my_frogs and dest not in board.enemy_frogs
+                best = min(best, sc)
+                beta = min(beta, sc)
+            if beta <= alpha or self.qs_left <= 0:
+                break
+        return best
+
+    def frontier(self, board, actions, maximizing):
+        """
+        Score every child of a depth-1 node in one `kernel.evaluate_batch`
+        call. Gives up the cutoffs among the leaves in exchange for a single
+        vectorised evaluation. Children where the side to move has noisy
+        moves are not quiet, so they are scored by `quiesce` instead, as in
+        `minimax`. Returns (best score, best action).
+        """
+        children, mine, theirs, noisy = [], [], [], []
+        reply = ENEMY if maximizing else ME
+        for act in actions:
+            undo = board.make(act)
+            children.append(act)
+            mine.append(board.frogs[ME])
+            theirs.append(board.frogs[ENEMY])
+            if self.QS_PLIES > 0 and self.movegen.noisy_actions(board, reply):
+                noisy.append(len(children) - 1)
+            board.unmake(undo)
+        if not children:
+            return None, None
+        self.nodes += len(children)
+        self.poll()
+        scores = kernel.evaluate_batch(mine, theirs, board.goal_rows)
+        for i in noisy:
+            if self.timed_out:
+                break
+            undo = board.make(children[i])
+            self.qs_left = self.QS_NODES
+            scores[i] = self.quiesce(
+                board, -math.inf, math.inf, not maximizing, self.QS_PLIES)
+            board.unmake(undo)
+        i = int(scores.argmax() if maximizing else scores.argmin())
+        return float(scores[i]), children[i]
+
+    def generate_actions(self, board, for_maximizer):
+        return self.movegen.actions(board, ME if for_maximizer else ENEMY)
 
     def update(self, color: PlayerColor, action: Action, **referee: dict):
         match action:
@@ -246,115 +403,17 @@ class Agent:
             case GrowAction():
                 if color == self._color:
                     self.board.apply_grow()
+                else:
+                    self.board.apply_grow(ENEMY)
             case _:
                 raise ValueError(f"Unknown action: {action}")
 
-def evaluate_move_progress(self, action, board):
-    if isinstance(action, MoveAction):
-        # Simulate the move
-        simulated_board = self.simulate_action(action, board, True)
 
-        goal_row = simulated_board.goal_row
-
-        current_distances = sum(abs(goal_row - frog.r) for frog in board.my_frogs)
-        new_distances = sum(abs(goal_row - frog.r) for frog in simulated_board.my_frogs)
-        total_distance_diff = abs(current_distances - new_distances)
-        
-        return total_distance_diff  # MoveAction progress
-    return 0
-
-def evaluate_move_efficiency(self, action):
-    if isinstance(action, MoveAction):
-
-         # Penalty for stagnation (no progress toward the goal row)
-        start_row = action.coord.r
-        end_row = action.coord.r + sum(d.value.r for d in action.directions)
-        if start_row == end_row:  # No progress
-            return -1  # Penalize stagnation
-        
-        # Prefer vertical and diagonal moves
-        if len(action.directions) == 1:
-            direction = action.directions[0]
-            if direction not in [Direction.Left, Direction.Right]:
-                return 1  # Strong penalty for horizontal moves
-            
-    return 0
-
-def evaluate_grow_action(self, board):
-    # Simulate the grow action
-    simulated_board = copy.deepcopy(board)
-    simulated_board.apply_grow()
-
-    # Determine the valid directions based on the player's goal row
-    if board.goal_row == 7:  # RED player
-        valid_directions = [Direction.Down, Direction.DownLeft, Direction.DownRight]
-    else:  # BLUE player
-        valid_directions = [Direction.Up, Direction.UpLeft, Direction.UpRight]
-
-    # Calculate the potential benefits of the grow action
-    benefit = 0
-    for frog in simulated_board.my_frogs:
-        if (frog.r == board.goal_row):
-            continue
-        for direction in valid_directions:
-            dr, dc = direction.value
-            rr, cc = frog.r + dr, frog.c + dc
-            if is_within_bounds(rr, cc):
-                dest = Coord(rr, cc)
-                if dest in simulated_board.lilypads and dest not in board.lilypads:
-                    benefit += 1  # Reward for enabling new forward moves
-    return benefit
-
-def frogs_on_second_last_row(self, board):
-    second_last_row = board.goal_row - 1 if board.goal_row > 0 else board.goal_row + 1
-    return [frog for frog in board.my_frogs if frog.r == second_last_row]
-
-def closest_lilypad_in_goal_row(self, frog, board):
-    goal_row = board.goal_row
-    lilypads_in_goal_row = [l for l in board.lilypads if l.r == goal_row]
-    if not lilypads_in_goal_row:
-        return None
-    # Find the closest lily pad by Manhattan distance
-    return min(lilypads_in_goal_row, key=lambda l: abs(l.r - frog.r) + abs(l.c - frog.c))
-
-def evaluate_grow_and_move(self, frog, board):
-    goal_row = board.goal_row
-    second_last_row = goal_row - 1 if goal_row > 0 else goal_row + 1
-
-    # Determine the valid directions based on the player's goal row
-    if goal_row == 7:  # RED player
-        valid_directions = [Direction.DownLeft, Direction.DownRight, Direction.Left, Direction.Right]
-    else:  # BLUE player
-        valid_directions = [Direction.UpLeft, Direction.UpRight, Direction.Left, Direction.Right]
-
-    # Find blank spaces in the goal row
-    blank_spaces = [Coord(goal_row, c) for c in range(8) if (Coord(goal_row, c) not in board.lilypads and Coord(goal_row, c) not in board.my_frogs and Coord(goal_row, c) not in board.enemy_frogs)]
-
-    best_option = None
-    best_cost = float('inf')
-
-    for blank in blank_spaces:
-        # Check if the frog can move next to the blank space
-        for direction in valid_directions:
-            dr, dc = direction.value
-
-            adjacent_r = blank.r - dr
-            adjacent_c = blank.c - dc
-
-            # Ensure the adjacent coordinate is within bounds
-            if not is_within_bounds(adjacent_r, adjacent_c):
-                continue
-
-            adjacent = Coord(adjacent_r, adjacent_c)
-            if adjacent in board.lilypads and adjacent not in board.my_frogs and adjacent not in board.enemy_frogs:
-                # Simulate moving next to the blank space, growing, and moving into the blank space
-                move_cost = abs(frog.r - adjacent.r) + abs(frog.c - adjacent.c)  # Cost to move next to the blank space
-                grow_cost = 1  # Growing takes 1 turn
-                move_into_blank_cost = 1  # Moving into the blank space takes 1 turn
-                total_cost = move_cost + grow_cost + move_into_blank_cost
-
-                if total_cost < best_cost:
-                    best_cost = total_cost
-                    best_option = (adjacent, blank)  # Store the adjacent position and the blank space
-
-    return best_option, best_cost
+class ParallelAgent(Agent):
+    """
+    Agent variant that splits each root search across worker processes, one
+    per spare core (select with `agent:ParallelAgent` on the referee command
+    line). Each move uses the same CPU time as `Agent`'s, spread over the
+    workers, so it takes less wall-clock time; see `agent.parallel.bench`.
+    """
+    WORKERS = max(1, available_cores() - 1)
@@ -0,0 +1,167 @@
+# Search instrumentation: per-move and per-depth statistics as JSON lines.
+
+import json
+import time
+
+
+class SearchStats:
+    """
+    Collects statistics about the agent's searches and appends one JSON
+    object per move to the file at `path`, so runs can be aggregated across
+    games (and across agent processes, which may share the file):
+
+        {"agent": "Agent", "turn": 12, "color": "RED", "source": "search",
+         "nodes": ..., "nps": ..., "cpu": ...,
+         "time": {"generation": ..., "ordering": ..., "evaluation": ...,
+                  "other": ...},
+         "depths": [{"depth": 1, "nodes": ..., "nps": ..., "branching": ...,
+                     "first_cutoff_rate": ..., "tt_hit_rate": ...,
+                     "time": {...}, "complete": true}, ...]}
+
+    Every move gets a record, with the `source` of the move: "book",
+    "grow" (an opening grow chosen without search), "forced", "endgame" or
+    "search". Times are exclusive: generation done on behalf of move
+    ordering counts as generation only. `instrument` wraps the agent's move
+    generator, orderer and evaluation so that none of this costs anything
+    when stats are off. For MCTSAgent, nodes are playouts.
+    """
+    TIMERS = ("generation", "ordering", "evaluation")
+
+    def __init__(self, path):
+        # Unbuffered: each record goes to the end of the file in one write
+        self.out = open(path, "ab", buffering=0)
+        self.timers = dict.fromkeys(self.TIMERS, 0.0)
+        self._stack: list[list[float]] = []
+        self._reset_counters()
+        self.record = None
+        self.agent = None
+
+    def _reset_counters(self):
+        self.expanded = 0  # interior nodes whose children were searched
+        self.children = 0  # children searched at those nodes
+        self.cutoffs = 0
+        self.first_cutoffs = 0  # cutoffs caused by the first child searched
+
+    # --- timing ---
+
+    def instrument(self, agent):
+        self.agent = type(agent).__name__
+        movegen = agent.movegen
+        movegen.actions = self.timed("generation", movegen.actions)
+        movegen.noisy_actions = self.timed("generation", movegen.noisy_actions)
+        movegen.is_legal = self.timed("generation", movegen.is_legal)
+        # Agents without an orderer or evaluation (MCTSAgent) leave them at 0
+        if hasattr(agent, "ordering"):
+            agent.ordering.staged = self.timed_generator("ordering", agent.ordering.staged)
+        if hasattr(agent, "evaluate"):
+            agent.evaluate = self.timed("evaluation", agent.evaluate)
+
+    def _enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _exit(self, name: str):
+        start, inner = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.timers[name] += elapsed - inner
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def timed(self, name: str, fn):
+        def wrapper(*args, **kwargs):
+            self._enter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._exit(name)
+        return wrapper
+
+    def timed_generator(self, name: str, fn):
+        # Only the work done inside each `next` counts, not the consumer's
+        def wrapper(*args, **kwargs):
+            gen = fn(*args, **kwargs)
+            while True:
+                self._enter()
+                try:
+                    item = next(gen)
+                except StopIteration:
+                    return
+                finally:
+                    self._exit(name)
+                yield item
+        return wrapper
+
+    # --- counting ---
+
+    def node(self, searched: int, cutoff: bool):
+        """
+        Called once per interior node with the number of children searched
+        and whether the node failed high (or low).
+        """
+        self.expanded += 1
+        self.children += searched
+        if cutoff:
+            self.cutoffs += 1
+            self.first_cutoffs += searched == 1
+
+    # --- records ---
+
+    def begin_move(self, turn: int, color, nodes: int, tt=None):
+        self.record = {"agent": self.agent, "turn": turn, "color": str(color),
+                       "depths": []}
+        self._move_start = (time.perf_counter(), time.process_time(), nodes,
+                            dict(self.timers))
+        self._depth_start = (time.perf_counter(), nodes, *_probes(tt),
+                             dict(self.timers))
+        self._reset_counters()
+
+    def end_depth(self, depth: int, nodes: int, tt, complete: bool):
+        if self.record is None:
+            return
+        start, start_nodes, probes, hits, timers = self._depth_start
+        elapsed = time.perf_counter() - start
+        searched = nodes - start_nodes
+        tt_probes, tt_hits = _probes(tt)
+        self.record["depths"].append({
+            "depth": depth,
+            "nodes": searched,
+            "nps": round(searched / elapsed) if elapsed else None,
+            "branching": _ratio(self.children, self.expanded),
+            "first_cutoff_rate": _ratio(self.first_cutoffs, self.cutoffs),
+            "tt_hit_rate": _ratio(tt_hits - hits, tt_probes - probes),
+            "time": self._split(elapsed, timers),
+            "complete": complete,
+        })
+        self._depth_start = (time.perf_counter(), nodes, *_probes(tt),
+                             dict(self.timers))
+        self._reset_counters()
+
+    def end_move(self, nodes: int, source: str, **extra):
+        if self.record is None:
+            return
+        start, start_cpu, start_nodes, timers = self._move_start
+        elapsed = time.perf_counter() - start
+        searched = nodes - start_nodes
+        self.record.update(
+            source=source,
+            nodes=searched,
+            nps=round(searched / elapsed) if elapsed else None,
+            cpu=round(time.process_time() - start_cpu, 6),
+            time=self._split(elapsed, timers),
+            **extra,
+        )
+        self.out.write((json.dumps(self.record) + "\n").encode())
+        self.record = None
+
+    def _split(self, elapsed: float, since: dict) -> dict:
+        split = {name: round(self.timers[name] - since[name], 6) for name in self.TIMERS}
+        split["other"] = round(elapsed - sum(split.values()), 6)
+        return split
+
+
+def _probes(tt) -> tuple[int, int]:
+    # (probes, hits) of a transposition table, if the agent has one
+    return (tt.probes, tt.hits) if tt is not None else (0, 0)
+
+
+def _ratio(num, den):
+    return round(num / den, 4) if den else None
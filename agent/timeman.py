@@ -0,0 +1,84 @@
+# Time management: budgets the game clock across the agent's moves.
+
+import time
+
+from referee.game import MAX_TURNS
+
+# Budget used when the referee does not enforce a time limit (seconds)
+DEFAULT_BUDGET = 1.0
+# Always plan for at least this many more moves of our own
+MIN_MOVES_LEFT = 10
+# Never spend more than this share of the remaining clock on one move
+MAX_SHARE = 0.25
+# Hard limit as a multiple of the allocated (soft) budget
+MAX_STRETCH = 3.0
+# Soft budget growth each time the best move changes between iterations
+INSTABILITY_STRETCH = 1.5
+# Don't start another iteration once this share of the soft budget is used;
+# it would almost certainly be cut off before finishing
+NEXT_ITERATION_SHARE = 0.5
+# Clock left untouched for referee overheads (seconds)
+SAFETY_MARGIN = 0.5
+
+
+class TimeManager:
+    """
+    Allocates a per-move budget from the remaining game clock, the number of
+    turns left in the game and how volatile the position is. The budget has
+    a soft limit, which decides whether to start another iteration and grows
+    while the best move keeps changing, and a hard limit, which aborts the
+    search mid-iteration.
+
+    The referee meters CPU time, so everything here is measured with
+    `time.process_time()`.
+    """
+    def __init__(self, default_budget: float = DEFAULT_BUDGET):
+        # Per-move budget when the referee does not report a clock
+        self.default_budget = default_budget
+        self.soft = default_budget
+        self.hard = default_budget
+        self._start = time.process_time()
+
+    def allocate(
+        self,
+        time_remaining: float | None,
+        plies_played: int,
+        volatility: float = 0.0
+    ):
+        """
+        Start the clock for a new move. `volatility` (0 to 1) stretches the
+        budget for positions where the search result is likely to change
+        with depth.
+        """
+        self._start = time.process_time()
+        if time_remaining is None:
+            self.soft = self.hard = self.default_budget
+            return
+
+        usable = max(0.0, time_remaining - SAFETY_MARGIN)
+        moves_left = max(MIN_MOVES_LEFT, (MAX_TURNS - plies_played) // 2)
+        cap = usable * MAX_SHARE
+        self.soft = min(usable / moves_left * (1.0 + volatility), cap)
+        self.hard = min(self.soft * MAX_STRETCH, cap)
+
+    def fixed(self, budget: float):
+        """
+        Start the clock with a fixed budget (no extensions).
+        """
+        self._start = time.process_time()
+        self.soft = self.hard = budget
+
+    def elapsed(self) -> float:
+        return time.process_time() - self._start
+
+    def out_of_time(self) -> bool:
+        return self.elapsed() >= self.hard
+
+    def should_deepen(self, best_changed: bool) -> bool:
+        """
+        Called after each completed iteration. An unstable best move earns
+        more time, up to the hard limit.
+        """
+        if best_changed:
+            self.soft = min(self.soft * INSTABILITY_STRETCH, self.hard)
+        return self.elapsed() < self.soft * NEXT_ITERATION_SHARE
@@ -0,0 +1,55 @@
+# Transposition table for the agent's alpha-beta search.
+
+# Bound types stored alongside each score
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Rough CPython cost of one stored entry: the entry tuple, its key and score
+# objects, and a share of the two slot lists. Used to turn a memory cap (MB)
+# into a number of slots.
+ENTRY_BYTES = 240
+
+
+class TranspositionTable:
+    """
+    A fixed-size, two-tier transposition table indexed by Zobrist key. Each
+    slot has a depth-preferred entry, which is only replaced by a search at
+    least as deep, and an always-replace entry that holds the most recent
+    result. Entries are (key, depth, bound, score, move) tuples.
+    """
+    def __init__(self, size_mb: float):
+        self._slots = max(1, int(size_mb * 2**20) // (2 * ENTRY_BYTES))
+        self._deep: list[tuple | None] = [None] * self._slots
+        self._recent: list[tuple | None] = [None] * self._slots
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return self._slots
+
+    def probe(self, key: int) -> tuple | None:
+        """
+        Return the deepest stored entry for `key`, or None if absent.
+        """
+        self.probes += 1
+        i = key % self._slots
+        entry = self._deep[i]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self._recent[i]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: float, move):
+        i = key % self._slots
+        entry = (key, depth, bound, score, move)
+        deep = self._deep[i]
+        if deep is None or depth >= deep[1]:
+            self._deep[i] = entry
+            # Keep the displaced entry around while it is still useful
+            if deep is not None and deep[0] != key:
+                self._recent[i] = deep
+        else:
+            self._recent[i] = entry
@@ -1,4 +1,21 @@
-from referee.game import Coord, Direction
+from referee.game import Coord, Direction, BOARD_N
+
+# Bitboard layout: square `r * BOARD_N + c` maps to bit `r * BOARD_N + c`, so
+# each row occupies one byte of the 64-bit mask (row 0 is the lowest byte).
+FULL_MASK = (1 << (BOARD_N * BOARD_N)) - 1
+COL_0_MASK = sum(1 << (r * BOARD_N) for r in range(BOARD_N))
+COL_7_MASK = COL_0_MASK << (BOARD_N - 1)
+ROW_MASK = 0xFF
+
+# (bit offset, source mask) per direction; the source mask drops the edge
+# column that would otherwise wrap around onto the next row.
+SHIFTS = {
+    d: (d.r * BOARD_N + d.c,
+        FULL_MASK & ~(COL_7_MASK if d.c == 1 else COL_0_MASK if d.c == -1 else 0))
+    for d in Direction
+}
+# The opposite of each direction, e.g. to step back to where a move came from
+REVERSE = {d: Direction((-d.r, -d.c)) for d in Direction}
 
 def is_within_bounds(row: int, col: int, size: int = 8) -> bool:
     return 0 <= row < size and 0 <= col < size
@@ -9,3 +26,59 @@ def apply_direction(coord: Coord, direction: Direction, step: int = 1) -> Coord:
     if not is_within_bounds(new_r, new_c):
         raise ValueError(f"Out of bounds: {new_r}, {new_c}")
     return Coord(new_r, new_c)
+
+def square(row: int, col: int) -> int:
+    return row * BOARD_N + col
+
+def coord_of(sq: int) -> Coord:
+    return COORDS[sq]
+
+def row_bits(mask: int, row: int) -> int:
+    return (mask >> (row * BOARD_N)) & ROW_MASK
+
+def shift(mask: int, direction: Direction) -> int:
+    """
+    Move every set bit of `mask` one cell in `direction`, dropping bits that
+    would leave the board.
+    """
+    offset, source = SHIFTS[direction]
+    mask &= source
+    if offset > 0:
+        return (mask << offset) & FULL_MASK
+    return mask >> -offset
+
+def iter_squares(mask: int):
+    """
+    Yield the square index of every set bit, lowest square first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# Lookup tables indexed by square, built once at import so that hot paths
+# never construct (and bounds-check) fresh Coord objects:
+#   COORDS[sq]          the Coord of the square
+#   STEP[d][sq]         the square one step away in direction d, or -1
+#   JUMP[d][sq]         (over, land) squares of a jump in direction d, or None
+#   NEIGHBOURS[sq]      mask of the (up to) 8 surrounding squares
+SQUARES = range(BOARD_N * BOARD_N)
+COORDS = [Coord(sq // BOARD_N, sq % BOARD_N) for sq in SQUARES]
+
+def _offset(sq: int, direction: Direction, step: int) -> int:
+    r, c = sq // BOARD_N + direction.r * step, sq % BOARD_N + direction.c * step
+    return square(r, c) if is_within_bounds(r, c, BOARD_N) else -1
+
+STEP = {d: [_offset(sq, d, 1) for sq in SQUARES] for d in Direction}
+JUMP = {
+    d: [
+        (_offset(sq, d, 1), _offset(sq, d, 2)) if _offset(sq, d, 2) >= 0 else None
+        for sq in SQUARES
+    ]
+    for d in Direction
+}
+NEIGHBOURS = [
+    sum(1 << STEP[d][sq] for d in Direction if STEP[d][sq] >= 0)
+    for sq in SQUARES
+]
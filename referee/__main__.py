@@ -1,7 +1,13 @@
 # COMP30024 Artificial Intelligence, Semester 1 2025
 # Project Part B: Game Playing Agent
 
+import sys
+
 from .main import main
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "tournament":
+        from .tournament import main as tournament_main
+        tournament_main(sys.argv[2:])
+    else:
+        main()
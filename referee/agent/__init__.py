@@ -11,6 +11,8 @@ from ..options import PlayerLoc, TIME_LIMIT_NOVALUE
 from .client import RemoteProcessClassClient, AsyncProcessStatus, \
     WrappedProcessException
 from .resources import ResourceLimitException
+from .inprocess import InProcessPlayer
+from .pool import AgentPool
 
 RECV_TIMEOUT = TIME_LIMIT_NOVALUE # Max seconds for agent to reply (wall clock)
 
@@ -35,6 +37,9 @@ class AgentProxyPlayer(Player):
         log: LogStream = NullLogger(),
         intercept_exc_type: Type[Exception] = PlayerException,
         subproc_output: bool = True,
+        seed: int | None = None,
+        framed: bool = True,
+        pool: AgentPool | None = None,
     ):
         '''
         Create an agent proxy player.
@@ -57,6 +62,13 @@ class AgentProxyPlayer(Player):
             caught from the agent process. 
         subproc_output: Whether to print the agent's stderr stream to the
             terminal. This is useful for debugging.
+        seed: If given, the agent process seeds Python's `random` module with
+            it before constructing the agent (for reproducible games).
+        framed: Whether to talk to the agent process with length-prefixed
+            binary messages (the default) or base64-encoded lines.
+        pool: If given, the agent process is taken from (and afterwards
+            returned to) this pool of warm processes where possible, rather
+            than started for this game alone.
         '''
         super().__init__(color)
 
@@ -72,9 +84,12 @@ class AgentProxyPlayer(Player):
             recv_timeout = RECV_TIMEOUT, 
             subproc_output = subproc_output,
             log = log,
+            seed = seed,
+            framed = framed,
             # Class constructor arguments (passed to agent)
             color = color
         )
+        self._pool = pool
         self._log = log
         self._ret_symbol = f"⤷" if log.setting("unicode") else "->"
         self._InterceptExc = intercept_exc_type
@@ -123,12 +138,29 @@ class AgentProxyPlayer(Player):
         # Import the agent class (in a separate process). Note: We are wrapping
         # another async context manager here, so need to use the __aenter__ and
         # __aexit__ methods.
-        self._log.debug(f"creating agent subprocess...")
+        warm = self._pool.take(self._agent) if self._pool is not None else None
+        if warm is None:
+            self._log.debug(f"creating agent subprocess...")
+            with self._intercept_exc():
+                await self._agent.__aenter__()
+            return self
+
+        # Construct the agent in a warm process instead
+        self._log.debug(f"reusing agent subprocess {warm.pid}...")
+        config, self._agent = self._agent, warm
         with self._intercept_exc():
-            await self._agent.__aenter__()
+            try:
+                await warm.reset(config)
+            except:
+                await self._pool.release(warm)
+                raise
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        if self._pool is not None:
+            await self._pool.release(self._agent, reusable=exc_type is None)
+            self._log.debug(f"agent process released")
+            return
         await self._agent.__aexit__(exc_type, exc_value, traceback)
         self._log.debug(f"agent process terminated")
 
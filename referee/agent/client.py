@@ -3,15 +3,16 @@
 
 import sys
 import traceback
-from asyncio import subprocess, wait_for
+from asyncio import subprocess, wait_for, IncompleteReadError
 from asyncio.subprocess import create_subprocess_exec, Process
 from asyncio.exceptions import TimeoutError as AIOTimeoutError
 from typing import Any
 
 from ..log import NullLogger, LogStream
 from .resources import ResourceLimitException
-from .io import AsyncProcessStatus, m_pickle, m_unpickle,\
-    _SUBPROC_MODULE, _ACK, _REPLY_OK, _REPLY_EXC, _CHUNK_LIMIT_KB
+from .io import AsyncProcessStatus, m_pickle, m_unpickle, m_frame, m_unframe,\
+    _SUBPROC_MODULE, _ACK, _REPLY_OK, _REPLY_EXC, _RESET, _CHUNK_LIMIT_KB, \
+    _FRAME_HEADER
 
 class WrappedProcessException(Exception):
     pass
@@ -30,6 +31,8 @@ class RemoteProcessClassClient:
         subproc_output: bool,
         *cons_args, 
         log: LogStream=NullLogger(),
+        seed: int | None = None, # Seeds `random` in the subprocess if given
+        framed: bool = True, # Binary framing (else the base64 line protocol)
         **cons_kwargs
     ):
         self._pkg = pkg
@@ -40,6 +43,9 @@ class RemoteProcessClassClient:
         self._recv_timeout = recv_timeout
         self._subproc_output = subproc_output
         self._log = log
+        self._seed = seed
+        self._framed = framed
+        self._encode = m_frame if framed else m_pickle
         self._cons_args = cons_args
         self._cons_kwargs = cons_kwargs
         self._proc: Process | None = None
@@ -55,6 +61,26 @@ class RemoteProcessClassClient:
     def status(self) -> AsyncProcessStatus | None:
         return self._status
 
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and not self._killed \
+            and self._proc.returncode is None
+
+    def _process_key(self) -> tuple:
+        # Settings fixed for the life of the subprocess (see `reset`)
+        return (self._recv_timeout, self._subproc_output, self._framed)
+
+    def _spec(self) -> tuple:
+        # Everything the subprocess needs to construct the class instance
+        return (
+            self._pkg, self._cls,
+            self._time_limit, self._space_limit,
+            self._res_limit_tolerance,
+            self._cons_args,
+            self._cons_kwargs,
+            self._seed,
+        )
+
     async def _recv_reply(self):
         assert self._proc is not None
         assert self._proc.stdout is not None
@@ -62,8 +88,8 @@ class RemoteProcessClassClient:
         self._log.debug(
             f"waiting for reply from subprocess {self._proc.pid} (stdout)")
         try:
-            line = await wait_for(
-                self._proc.stdout.readline(),
+            reply = await wait_for(
+                self._read_message(),
                 timeout=self._recv_timeout
             )
         except AIOTimeoutError as e:
@@ -76,10 +102,25 @@ class RemoteProcessClassClient:
                 f"({self._recv_timeout}s) exceeded"
             ) from e
 
-        if not line:
+        if reply is None:
             raise EOFError("expected result, got EOF")
 
-        return await self._process_reply(m_unpickle(line))
+        return await self._process_reply(reply)
+
+    async def _read_message(self) -> Any | None:
+        # One message from the subprocess, or None at EOF
+        assert self._proc is not None
+        assert self._proc.stdout is not None
+        stdout = self._proc.stdout
+        if not self._framed:
+            line = await stdout.readline()
+            return m_unpickle(line) if line else None
+        try:
+            header = await stdout.readexactly(_FRAME_HEADER.size)
+            (size,) = _FRAME_HEADER.unpack(header)
+            return m_unframe(await stdout.readexactly(size))
+        except IncompleteReadError:
+            return None
 
     async def _process_reply(self, reply: tuple[Any, ...]):
         assert self._proc is not None
@@ -124,13 +165,7 @@ class RemoteProcessClassClient:
         # Start subprocess
         self._proc = await create_subprocess_exec(
             sys.executable, "-m", _SUBPROC_MODULE,
-            m_pickle((
-                self._pkg, self._cls,
-                self._time_limit, self._space_limit,
-                self._res_limit_tolerance,
-                self._cons_args, 
-                self._cons_kwargs
-            )),
+            m_pickle((*self._spec(), self._framed)),
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL if not self._subproc_output else None,
@@ -156,6 +191,33 @@ class RemoteProcessClassClient:
             raise
         return self
 
+    async def reset(self, other: 'RemoteProcessClassClient'):
+        '''
+        Reuse this (running) subprocess for `other`: the class instance is
+        replaced with one constructed from `other`'s class and arguments, and
+        resource accounting restarts with its limits. Process-level settings
+        (output, framing, reply timeout) are kept. Raises as for `__aenter__`
+        if construction fails, in which case the subprocess is still usable.
+        '''
+        assert self._proc is not None
+        assert self._proc.stdin is not None
+        self._pkg, self._cls = other._pkg, other._cls
+        self._time_limit = other._time_limit
+        self._space_limit = other._space_limit
+        self._res_limit_tolerance = other._res_limit_tolerance
+        self._cons_args = other._cons_args
+        self._cons_kwargs = other._cons_kwargs
+        self._seed = other._seed
+        self._log = other._log
+        self._status = None
+
+        self._log.debug(
+            f"resetting subprocess {self._proc.pid} with class "
+            f"'{self._pkg}:{self._cls}'"
+        )
+        self._proc.stdin.write(self._encode((_RESET, self._spec(), {})))
+        assert await self._recv_reply() == _ACK
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         assert self._proc is not None
         assert self._proc.stdin is not None
@@ -193,7 +255,7 @@ class RemoteProcessClassClient:
                 f"send method call request to subprocess "
                 f"{self._proc.pid} (stdin)"
             )
-            self._proc.stdin.write(m_pickle((name, args, kwargs)))
+            self._proc.stdin.write(self._encode((name, args, kwargs)))
             return await self._recv_reply()
 
         return call
@@ -0,0 +1,154 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+import random
+import sys
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+from importlib import import_module
+from importlib.util import find_spec
+from io import StringIO
+from traceback import format_exc
+from typing import Type
+
+from ..game.player import Player
+from ..log import LogStream, NullLogger
+from ..game import Action, PlayerColor, PlayerException
+from ..options import PlayerLoc
+from .resources import CountdownTimer, MemoryWatcher, ResourceLimitException, \
+    set_space_line
+
+
+class InProcessPlayer(Player):
+    """
+    A faster alternative to `AgentProxyPlayer` for trusted agents: the Agent
+    class is imported and called directly in the referee's own process, so
+    there is no subprocess to spawn and no pickling or pipe round trip per
+    call. Resource use is still accounted with `CountdownTimer` and
+    `MemoryWatcher`, and passed to the agent as with `AgentProxyPlayer`.
+
+    Nothing isolates the agent from the referee, so only use this for code
+    you trust (e.g. high-volume self-play). Note that memory is measured for
+    the whole process, so the space limit applies to both agents and the
+    referee combined, and that both agents share the `random` module.
+    """
+
+    def __init__(self,
+        name: str,
+        color: PlayerColor,
+        agent_loc: PlayerLoc,
+        time_limit: float | None,
+        space_limit: float | None,
+        res_limit_tolerance: float = 1.0,
+        log: LogStream = NullLogger(),
+        intercept_exc_type: Type[Exception] = PlayerException,
+        output: bool = True,
+        seed: int | None = None,
+    ):
+        '''
+        Create an in-process player. The arguments are as for
+        `AgentProxyPlayer`, except:
+
+        output: Whether to show the agent's output (printed to stderr, as
+            for agents in a subprocess) or discard it.
+        seed: If given, `random` is seeded with it before constructing the
+            agent.
+        '''
+        super().__init__(color)
+
+        assert isinstance(agent_loc, PlayerLoc), "agent_loc must be a PlayerLoc"
+        self._pkg, self._cls = agent_loc
+
+        self._name = name
+        self._time_limit = time_limit or 0
+        self._space_limit = space_limit or 0
+        # Only the youngest generation is collected before each call: a full
+        # collection walks both agents' (and the referee's) whole heaps
+        self._timer = CountdownTimer(
+            self._time_limit, res_limit_tolerance, gc_generation=0)
+        self._space = MemoryWatcher(self._space_limit, res_limit_tolerance)
+        self._output = output
+        self._seed = seed
+        self._instance = None
+        self._log = log
+        self._ret_symbol = f"⤷" if log.setting("unicode") else "->"
+        self._InterceptExc = intercept_exc_type
+
+    def _referee(self) -> dict:
+        # Same keyword arguments as agents in a subprocess receive
+        timer, space = self._timer, self._space
+        time_rem = self._time_limit - timer.total() \
+            if self._time_limit > 0 else None
+        space_rem = self._space_limit - space.curr() \
+            if space.curr() > 0 else None
+        if space.enabled() and space.curr() == -1:
+            space_rem = self._space_limit if self._space_limit > 0 else None
+        return {
+            "time_remaining": time_rem,
+            "space_remaining": space_rem,
+            "space_limit": self._space_limit if self._space_limit > 0 else None,
+        }
+
+    @contextmanager
+    def _call(self):
+        # Agent output goes to stderr (or nowhere), never the referee's stdout
+        out = sys.stderr if self._output else StringIO()
+        try:
+            with redirect_stdout(out), redirect_stderr(out), \
+                    self._timer, self._space:
+                yield
+
+        except ResourceLimitException as e:
+            self._log.error(f"resource limit exceeded: {str(e)}")
+            raise self._InterceptExc(
+                f"{str(e)} in {self._name} agent",
+                self._color
+            )
+
+        except Exception:
+            err_lines = format_exc().splitlines()
+            self._log.error(f"exception caught:")
+            self._log.error("\n")
+            self._log.error("\n".join([f">> {line}" for line in err_lines]))
+            self._log.error("\n")
+            raise self._InterceptExc(
+                f"error in {self._name} agent\n"
+                f"{self._ret_symbol} {err_lines[-1]}",
+                self._color
+            )
+
+    async def __aenter__(self) -> 'InProcessPlayer':
+        self._log.debug(f"creating agent in-process...")
+        # As in the subprocess, count numpy towards the baseline, not the agent
+        if find_spec("numpy") is not None:
+            import numpy
+        if not self._space.enabled():
+            # Once per process, so that later agents don't move the baseline
+            set_space_line()
+        if self._seed is not None:
+            random.seed(self._seed)
+        with self._call():
+            Cls = getattr(import_module(self._pkg), self._cls)
+            self._instance = Cls(self._color, **self._referee())
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._instance = None
+        self._log.debug(f"agent released")
+
+    async def action(self) -> Action:
+        """
+        Get the agent's action for the current turn.
+        """
+        self._log.debug(f"call 'action()'...")
+        with self._call():
+            action: Action = self._instance.action(**self._referee())
+        self._log.debug(f"{self._ret_symbol} {action!r}")
+        return action
+
+    async def update(self, color: PlayerColor, action: Action):
+        """
+        Update the agent with the latest action from the game.
+        """
+        self._log.debug(f"call 'update({color!r}, {action!r})'...")
+        with self._call():
+            self._instance.update(color, action, **self._referee())
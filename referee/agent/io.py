@@ -4,6 +4,7 @@
 import binascii
 from contextlib import contextmanager
 import pickle
+import struct
 from dataclasses import dataclass
 from binascii import b2a_base64, a2b_base64
 from typing import Any
@@ -14,6 +15,15 @@ _ACK = "ACK"
 _REPLY_OK = b"OK"
 _REPLY_EXC = b"EXC"
 _CHUNK_LIMIT_KB = 1024
+# Control message (in place of a method name) asking a warm process to
+# construct a new class instance for the next game
+_RESET = b"RESET"
+
+# Binary framing: each message is a fixed header holding the payload length,
+# then the raw pickle. Used unless a client falls back to the (base64) line
+# protocol above.
+_FRAME_HEADER = struct.Struct(">I")
+_FRAME_PROTOCOL = 5
 
 
 class InterchangeException(Exception):
@@ -47,3 +57,12 @@ def m_pickle(o: Any) -> bytes:
 def m_unpickle(b: bytes) -> Any:
     with catch_exceptions("unpickle", b):
         return pickle.loads(a2b_base64(b))
+
+def m_frame(o: Any) -> bytes:
+    with catch_exceptions("pickle", o):
+        payload = pickle.dumps(o, protocol=_FRAME_PROTOCOL)
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+def m_unframe(payload: bytes) -> Any:
+    with catch_exceptions("unpickle", payload):
+        return pickle.loads(payload)
@@ -0,0 +1,73 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+from .client import RemoteProcessClassClient
+
+
+class AgentPool:
+    """
+    A pool of warm agent subprocesses, reused from one game to the next. A
+    new Python interpreter (and its imports of the referee, numpy and the
+    agent package) is only paid for when no idle process is available;
+    otherwise an idle process is reset, constructing a fresh instance of the
+    requested agent class with fresh resource accounting.
+
+    Processes are only returned to the pool after a game ended cleanly: one
+    whose agent raised, exceeded a limit or was killed is shut down instead.
+    The process's peak memory can't be reset, so until a game uses more than
+    the games before it, its peak is the most it was seen using between
+    calls (see `MemoryWatcher`).
+
+    Pass a pool to `AgentProxyPlayer`s to use it. All games sharing a pool
+    must run on the same event loop, as the subprocesses belong to it.
+    """
+
+    def __init__(self, size: int = 2):
+        '''
+        Create an empty pool that keeps up to `size` idle processes (of each
+        combination of process-level settings).
+        '''
+        self._size = size
+        self._idle: dict[tuple, list[RemoteProcessClassClient]] = {}
+
+    def take(self, client: RemoteProcessClassClient) \
+            -> RemoteProcessClassClient | None:
+        """
+        Remove and return an idle process that could run `client` (which has
+        not been started), or None if there is none. The caller should then
+        `reset` it with `client`, and eventually `release` it.
+        """
+        idle = self._idle.get(client._process_key(), [])
+        while idle:
+            warm = idle.pop()
+            if warm.alive:
+                return warm
+        return None
+
+    async def release(self, client: RemoteProcessClassClient,
+            reusable: bool = True):
+        """
+        Return a started process to the pool, or shut it down if it is not
+        `reusable` (or the pool is full).
+        """
+        idle = self._idle.setdefault(client._process_key(), [])
+        if reusable and client.alive and len(idle) < self._size:
+            idle.append(client)
+        else:
+            await client.__aexit__(None, None, None)
+
+    async def close(self):
+        """
+        Shut down all idle processes.
+        """
+        idle, self._idle = self._idle, {}
+        for clients in idle.values():
+            for client in clients:
+                if client.alive:
+                    await client.__aexit__(None, None, None)
+
+    async def __aenter__(self) -> 'AgentPool':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -19,15 +19,18 @@ class CountdownTimer:
       after the allocated time has passed
     """
 
-    def __init__(self, time_limit, tolerance=1.0):
+    def __init__(self, time_limit, tolerance=1.0, gc_generation=2):
         """
         Create a new countdown timer with time limit `limit`, in seconds
         (0 for unlimited time). If `tolerance` is specified, the timer will
         allow the process to run for `tolerance` times the specified limit
-        before throwing an exception.
+        before throwing an exception. `gc_generation` is the oldest garbage
+        collector generation collected (off the clock) on entry; a full
+        collection (2) can dominate short calls in a large process.
         """
         self._limit = time_limit
         self._tolerance = tolerance
+        self._gc_generation = gc_generation
         self._clock = 0
         self._delta = 0
 
@@ -39,7 +42,7 @@ class CountdownTimer:
 
     def __enter__(self):
         # clean up memory off the clock
-        gc.collect()
+        gc.collect(self._gc_generation)
         # then start timing
         self.start = time.process_time()
         return self  # unused
@@ -66,6 +69,10 @@ class MemoryWatcher:
     * works by parsing procfs; only available on linux.
     * unless the limit is set to 0, throws an exception upon exiting the
       context if the memory limit has been breached
+    * the process's peak (VmPeak) can't be reset, so a watcher created in a
+      process that has already peaked (e.g. a warm process, for its next
+      game) reports the largest usage it sees itself until the process
+      peaks again
     """
 
     def __init__(self, space_limit, tolerance=1.0):
@@ -73,6 +80,8 @@ class MemoryWatcher:
         self._tolerance = tolerance
         self._curr_usage = -1
         self._peak_usage = -1
+        # process peak so far, which this watcher shouldn't be charged for
+        self._start_peak = _get_space_usage()[1] if _SPACE_ENABLED else None
 
     def curr(self):
         return self._curr_usage
@@ -92,12 +101,17 @@ class MemoryWatcher:
         stats and ensuring that peak usage is not exceeding limits
         """
         if _SPACE_ENABLED:
-            self._curr_usage, self._peak_usage = _get_space_usage()
+            curr_usage, peak_usage = _get_space_usage()
+            if self._start_peak is not None and peak_usage <= self._start_peak:
+                # the process peaked before this watcher: our own peak is
+                # the most we have seen in use since
+                peak_usage = max(
+                    curr_usage, self._peak_usage + _DEFAULT_MEM_USAGE)
 
             # adjust measurements to reflect usage of agents and referee, not
             # the Python interpreter itself
-            self._curr_usage -= _DEFAULT_MEM_USAGE
-            self._peak_usage -= _DEFAULT_MEM_USAGE
+            self._curr_usage = curr_usage - _DEFAULT_MEM_USAGE
+            self._peak_usage = peak_usage - _DEFAULT_MEM_USAGE
 
             # if we are limited, let's hope we are not out of space!
             if self._limit is not None and self._limit > 0:
@@ -2,6 +2,7 @@
 # Project Part B: Game Playing Agent
 
 import sys
+import random
 from contextlib import contextmanager
 from importlib import import_module
 from importlib.util import find_spec
@@ -9,8 +10,8 @@ from traceback import format_exc
 from typing import Any
 
 from .resources import CountdownTimer, MemoryWatcher, set_space_line
-from .io import AsyncProcessStatus, m_pickle, m_unpickle,\
-    _ACK, _REPLY_OK, _REPLY_EXC
+from .io import AsyncProcessStatus, m_pickle, m_unpickle, m_frame, m_unframe,\
+    _ACK, _REPLY_OK, _REPLY_EXC, _RESET, _FRAME_HEADER
 
 _STDOUT_OVERRIDE_MESSAGE = "stdout usage is not allowed in agent (use stderr)"
 _STDIN_OVERRIDE_MESSAGE = "stdin usage is not allowed in agent"
@@ -67,11 +68,13 @@ def main():
             return False
 
     # Command line arguments are the class/constructor arguments
+    *spec, framed = _s_unpickle(sys.argv[1])
     cls_module, cls_name, \
         time_limit, space_limit, \
         res_limit_tolerance, \
-        cons_args, cons_kwargs \
-        = _s_unpickle(sys.argv[1])
+        cons_args, cons_kwargs, \
+        seed \
+        = spec
 
     # Create some context managers for resource tracking
     timer = CountdownTimer(time_limit, res_limit_tolerance)
@@ -100,6 +103,12 @@ def main():
 
     # Comms functions
     def _recv() -> Any:
+        if framed:
+            header = in_stream.buffer.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size: # EOF (see __aexit__ above)
+                exit(0)
+            (size,) = _FRAME_HEADER.unpack(header)
+            return m_unframe(in_stream.buffer.read(size))
         line = in_stream.readline()
         if not line: # EOF, process should exit (see __aexit__ above)
             exit(0)
@@ -107,14 +116,34 @@ def main():
 
     def _reply(*args: Any):
         # Reply is a tuple of (status, arg0, arg1, ...)
+        if framed:
+            # Pickle the reply once, falling back if the result can't be
+            status = _get_status()
+            try:
+                frame = m_frame((status, *args))
+            except Exception:
+                # Same shape of reply, with what couldn't be pickled replaced
+                if args[0] == _REPLY_EXC:
+                    args = (args[0], RuntimeError(repr(args[1])), *args[2:])
+                else:
+                    args = (args[0], "<unpickleable>")
+                frame = m_frame((status, *args))
+            out_stream.buffer.write(frame)
+            out_stream.buffer.flush()
+            return
         out_stream.write(_s_pickle((_get_status(), *args)))
         out_stream.flush()
 
+    failed = False
+
     @contextmanager
     def _relay_exceptions():
+        nonlocal failed
+        failed = False
         try:
             yield
         except Exception as e:
+            failed = True
             stacktrace_str = "\n".join(format_exc().splitlines()[5:])
             _reply(_REPLY_EXC, e, stacktrace_str)
 
@@ -124,25 +153,52 @@ def main():
         import numpy
 
     # Construct class instance
-    with _relay_exceptions(), timer, space:
-        set_space_line()
-        Cls = getattr(import_module(cls_module), cls_name)
-        instance = Cls(*cons_args, **{**cons_kwargs, **_referee()})
-    _reply(_REPLY_OK, _ACK)
+    def _construct():
+        nonlocal instance
+        # Reproducible games (e.g. in tournaments) seed the agent's `random`
+        if seed is not None:
+            random.seed(seed)
+        with _relay_exceptions(), timer, space:
+            if not space.enabled():
+                set_space_line()
+            Cls = getattr(import_module(cls_module), cls_name)
+            instance = Cls(*cons_args, **{**cons_kwargs, **_referee()})
+        if not failed:
+            _reply(_REPLY_OK, _ACK)
+
+    instance = None
+    _construct()
 
     # Main client subprocess loop
     while True:
         message = _recv()
         name, args, kwargs = message
+
+        # Reset (warm process): a new instance and resource accounting for the
+        # next game, without re-importing anything (the new MemoryWatcher
+        # doesn't charge this game for earlier games' peaks).
+        if name == _RESET:
+            cls_module, cls_name, \
+                time_limit, space_limit, \
+                res_limit_tolerance, \
+                cons_args, cons_kwargs, \
+                seed \
+                = args
+            timer = CountdownTimer(time_limit, res_limit_tolerance)
+            space = MemoryWatcher(space_limit, res_limit_tolerance)
+            instance = None
+            _construct()
+            continue
         
         # Call method
         result = None
         with _relay_exceptions(), timer, space:
             result = getattr(instance, name)(*args, **{**kwargs, **_referee()})
-            if not _is_pickleable(result):
+            if not framed and not _is_pickleable(result):
                 result = "<unpickleable>"
         
-        _reply(_REPLY_OK, result)
+        if not failed:
+            _reply(_REPLY_OK, result)
 
 # Only run if directly invoked
 if __name__ == "__main__" and sys.argv[0].endswith(__file__):
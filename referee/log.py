@@ -1,11 +1,17 @@
 # COMP30024 Artificial Intelligence, Semester 1 2025
 # Project Part B: Game Playing Agent
 
+import atexit
+import threading
 from enum import Enum
+from pathlib import Path
 from time import time
 from typing import Any, Callable
 from inspect import signature
 
+FLUSH_BYTES = 1 << 16 # Buffered log output is written once it reaches this,
+FLUSH_INTERVAL = 1.0 # or once this many seconds have passed since the last
+
 
 class LogColor(Enum):
     """
@@ -224,6 +230,99 @@ class LogStream:
 
         return f"{LogColor.RESET_ALL}"
 
+class BufferedFileHandler:
+    """
+    A `LogStream` handler appending messages to a file, which is kept open and
+    written in batches: once `flush_bytes` of messages are waiting, or when a
+    message arrives `flush_interval` seconds after the last write. With
+    `background` set, a thread does the writing (and also writes on the
+    interval while no messages arrive), so logging never waits for the disk.
+
+    Everything buffered is written on `flush` and `close`, and also when the
+    interpreter exits (including on an unhandled exception), so nothing is
+    lost unless the process is killed outright.
+    """
+    def __init__(self,
+        path: Path | str,
+        flush_bytes: int = FLUSH_BYTES,
+        flush_interval: float = FLUSH_INTERVAL,
+        background: bool = False,
+    ):
+        self._file = open(path, "a")
+        self._flush_bytes = flush_bytes
+        self._flush_interval = flush_interval
+        self._buffer: list[str] = []
+        self._size = 0
+        self._last_write = time()
+        self._closing = False
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def __call__(self, message: str):
+        with self._lock:
+            if self._closing:
+                return
+            self._buffer.append(message + "\n")
+            self._size += len(message) + 1
+            due = self._size >= self._flush_bytes or \
+                time() - self._last_write >= self._flush_interval
+            if due and self._thread is not None:
+                self._wake.notify()
+        if due and self._thread is None:
+            self._write()
+
+    def _write(self):
+        # Write out everything buffered so far (in order, if called from
+        # several threads at once)
+        with self._write_lock:
+            with self._lock:
+                lines, self._buffer, self._size = self._buffer, [], 0
+                self._last_write = time()
+            if lines and not self._file.closed:
+                self._file.write("".join(lines))
+                self._file.flush()
+
+    def _run(self):
+        while True:
+            with self._wake:
+                self._wake.wait_for(
+                    lambda: self._closing or self._size >= self._flush_bytes,
+                    timeout=self._flush_interval,
+                )
+                closing = self._closing
+            self._write()
+            if closing:
+                return
+
+    def flush(self):
+        """
+        Write out all buffered messages now.
+        """
+        self._write()
+
+    def close(self):
+        """
+        Write out all buffered messages and close the file. Any later
+        messages are dropped.
+        """
+        with self._wake:
+            if self._closing:
+                return
+            self._closing = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._write()
+        self._file.close()
+        atexit.unregister(self.close)
+
+
 class NullLogger(LogStream):
     """
     A simple null logger that does not log anything. Can be used to disable
@@ -19,7 +19,7 @@ from traceback import format_tb
 from referee.server.game import RemoteGame
 
 from .game import Player, PlayerColor
-from .log import LogStream, LogColor, LogLevel
+from .log import LogStream, LogColor, LogLevel, BufferedFileHandler
 from .run import game_user_wait, run_game, \
     game_commentator, game_event_logger, game_delay, output_board_updates
 from .agent import AgentProxyPlayer
@@ -52,6 +52,7 @@ def main(options: Namespace|None=None):
     # Game log stream
     gl: LogStream | None = None
     gl_path: Path | None = None
+    gl_handler: BufferedFileHandler | None = None
 
     if options.logfile is not None:
 
@@ -71,16 +72,14 @@ def main(options: Namespace|None=None):
                 rl.debug(f"clearing existing log file '{options.logfile}'")
                 gl_path.unlink()
 
-            def game_log_handler(message: str):
-                if gl_path is not None:
-                    with open(gl_path, "a") as f:
-                        f.write(message + "\n")
-            
+            # Kept open and written in batches (flushed at exit at the latest)
+            gl_handler = BufferedFileHandler(gl_path)
+
             # File game log stream
             gl = LogStream(
                 namespace="game", 
                 ansi=False,
-                handlers=[game_log_handler],
+                handlers=[gl_handler],
                 output_namespace=False,
                 output_level=False,
             )
@@ -161,6 +160,10 @@ def main(options: Namespace|None=None):
         
         [game_result, _] = asyncio.run(_run_all(), debug=True)
 
+        # The game is over, so the game log is complete
+        if gl_handler is not None:
+            gl_handler.close()
+
         # Print the final result under all circumstances
         if game_result is None:
             rl.critical("result: draw")
@@ -179,6 +182,9 @@ def main(options: Namespace|None=None):
         rl.info("KeyboardInterrupt: bye!")
 
         rl.critical("result: <interrupt>")
+        # (killing the process skips exit handlers, so flush the log first)
+        if gl_handler is not None:
+            gl_handler.close()
         os.kill(os.getpid(), 9)
 
     except Exception as e:
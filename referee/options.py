@@ -259,19 +259,23 @@ class PackageSpecAction(argparse.Action):
                 self, "expected a string, got %r" % (values,)
             )
 
-        pkg_spec = values
+        # save the result in the arguments namespace as a PlayerLoc
+        setattr(namespace, self.dest, parse_package_spec(values))
 
-        # detect alternative class:
-        if ":" in pkg_spec:
-            pkg, cls = pkg_spec.split(":", maxsplit=1)
-        else:
-            pkg = pkg_spec
-            cls = "Agent"
 
-        # try to convert path to module name
-        mod = pkg.strip("/\\").replace("/", ".").replace("\\", ".")
-        if mod.endswith(".py"):  # NOTE: Assumes submodule is not named `py`.
-            mod = mod[:-3]
+def parse_package_spec(pkg_spec: str) -> PlayerLoc:
+    """Convert a package specification (see PKG_SPEC_HELP) to a PlayerLoc."""
 
-        # save the result in the arguments namespace as a PlayerLoc
-        setattr(namespace, self.dest, PlayerLoc(mod, cls))
+    # detect alternative class:
+    if ":" in pkg_spec:
+        pkg, cls = pkg_spec.split(":", maxsplit=1)
+    else:
+        pkg = pkg_spec
+        cls = "Agent"
+
+    # try to convert path to module name
+    mod = pkg.strip("/\\").replace("/", ".").replace("\\", ".")
+    if mod.endswith(".py"):  # NOTE: Assumes submodule is not named `py`.
+        mod = mod[:-3]
+
+    return PlayerLoc(mod, cls)
@@ -3,3 +3,4 @@
 
 from .server import RemoteServer, InvalidAckError
 from .game import RemoteGame
+from .hub import GameHub, hub_publisher
@@ -6,24 +6,44 @@ from dataclasses import asdict
 from time import time
 from typing import AsyncGenerator
 
-from .server import RemoteServer
+from .server import RemoteServer, InvalidAckError
 from .serialization import serialize_game_update
-from ..game import GameUpdate, PlayerColor, GameBegin, GameEnd
+from ..game import GameUpdate, PlayerColor, GameBegin, GameEnd, BoardUpdate
+
+ACK_WINDOW = 64 # Max game updates sent but not yet acknowledged
+KEYFRAME_INTERVAL = 16 # Every nth board update carries the whole board
 
 
 class RemoteGame:
     """
     A remote game instance that can sync updates with a client.
+
+    Updates are pipelined: each is sent with its index in the game as `id`,
+    and the game only waits for the client once `window` updates are
+    unacknowledged. Acks are cumulative (an ack of `id` covers every update
+    up to it). While no client is connected the game doesn't wait at all,
+    and when a client (re)connects, the metadata and every update so far are
+    resent, so clients should ignore ids they have already applied.
+
+    Board updates only carry the cells that changed, except for every
+    `keyframe_interval`th one, which carries the whole board.
     """
     def __init__(
-            self, 
+            self,
             server: RemoteServer,
             player_names: list[str],
-            game_log_lines: list[str]
+            game_log_lines: list[str],
+            window: int = ACK_WINDOW,
+            keyframe_interval: int = KEYFRAME_INTERVAL,
         ):
         self._server = server
         self._player_names = player_names
-        self._history = []
+        self._window = window
+        self._keyframe_interval = keyframe_interval
+        self._board_updates = 0
+        self._history: list[dict] = []
+        self._acked = 0 # Updates acknowledged so far
+        self._connects = server.connects
 
     async def event_handler(self) -> AsyncGenerator:
         """
@@ -33,31 +53,87 @@ class RemoteGame:
             update: GameUpdate | None = yield
             assert update is not None
 
-            match update:
-                case GameBegin(board):
-                    self._history.clear()
-                    self._server._log.debug("syncing game metadata...")
-                    await self.sync_game_metadata()
-
             try:
-                serialized_update = serialize_game_update(update)
-        
-                await self._server.sync(serialized_update, len(self._history))
+                if self._server.connects != self._connects:
+                    await self._resend()
+
+                match update:
+                    case GameBegin(board):
+                        self._history.clear()
+                        self._acked = 0
+                        self._board_updates = 0
+                        self._server._log.debug("syncing game metadata...")
+                        await self.sync_game_metadata()
+
+                # Keep the window open (this only waits on a slow client)
+                await self._await_acks(self._window - 1)
+
+                keyframe = True
+                match update:
+                    case BoardUpdate():
+                        self._board_updates += 1
+                        keyframe = \
+                            self._board_updates % self._keyframe_interval == 0
+                serialized_update = serialize_game_update(update, keyframe)
+                id = len(self._history)
+                self._history.append(serialized_update)
+                await self._server.send(serialized_update, id)
 
                 self._server._log.debug(f"broadcasted game update: {serialized_update}")
-                self._history.append(update)
-                
+
+                match update:
+                    case GameEnd():
+                        # Let the client catch up before the game is over
+                        await self._await_acks(0)
+
             except Exception as e:
                 self._server._log.error(f"error broadcasting game update: {e}")
                 raise e
-    
-    async def sync_game_metadata(self):
+
+    async def _await_acks(self, outstanding: int):
+        """
+        Wait until at most `outstanding` updates are unacknowledged, or no
+        client is connected.
         """
-        Send game metadata to the client, e.g. player names. 
+        while len(self._history) - self._acked > outstanding:
+            self._server._log.debug("waiting for <ack>...")
+            response = await self._server.receive('<ack>')
+            if response is None:
+                return # No client: resend on reconnect
+            id = response.get("id")
+            if id is None:
+                continue # Ack of a message outside the game's updates
+            if not 0 <= id < len(self._history):
+                await self._server.stop()
+                raise InvalidAckError(
+                    f"expected ack ID below {len(self._history)}, got {response}")
+            self._acked = max(self._acked, id + 1)
+
+    async def _resend(self):
         """
-        message = {
+        Bring a newly connected client up to date with the game so far.
+        """
+        self._connects = self._server.connects
+        self._server.discard('<ack>')
+        self._acked = 0
+        if not self._history:
+            return
+        self._server._log.debug(
+            f"client connected, resending {len(self._history)} game updates...")
+        await self._server.send(self._metadata())
+        for id, serialized_update in enumerate(self._history):
+            await self._server.send(serialized_update, id)
+
+    def _metadata(self) -> dict:
+        return {
             "type": "GameMetadata",
             "players": self._player_names,
         }
-        await self._server.sync(message)
+
+    async def sync_game_metadata(self):
+        """
+        Send game metadata to the client, e.g. player names.
+        """
+        message = self._metadata()
+        await self._server.send(message)
         self._server._log.debug(f"sent game metadata: {message}")
@@ -0,0 +1,258 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# A spectator hub for many concurrent games (e.g. a tournament run). Games
+# publish their updates to the hub, which keeps just enough state per game
+# to bring a spectator up to date (the players, the turn and the board), and
+# fans each update out to the clients subscribed to that game. Clients send:
+#
+#   {"type": "<list>"}                        -> a GameList of all games
+#   {"type": "<subscribe>", "game": <id>}     -> the game's updates from now
+#   {"type": "<unsubscribe>", "game": <id>}
+#
+# Every message to a client carries the "game" it belongs to. Updates are not
+# acknowledged: each client has a bounded queue instead, and a client that
+# falls too far behind has its queue replaced by a resync of each of its
+# games (metadata and a board keyframe), so a slow client never stalls a game.
+
+import asyncio
+import json
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Callable
+
+import websockets
+
+from ..log import LogStream, NullLogger
+from ..game import GameUpdate, GameBegin
+from .game import KEYFRAME_INTERVAL
+from .server import LISTEN_HOST, LISTEN_PORT
+from .serialization import serialize_game_update
+
+SUBSCRIBER_QUEUE = 256 # Max messages waiting to be sent to a client
+
+
+@dataclass
+class _HubGame:
+    metadata: dict | None = None
+    board: list[list[int]] | None = None
+    updates: int = 0
+    board_updates: int = 0
+    turn: int = 0
+    winner: int | None = None
+    subscribers: set['_Subscriber'] = field(default_factory=set)
+
+
+class _Subscriber:
+    def __init__(self, websocket, limit: int):
+        self.websocket = websocket
+        self.limit = limit
+        self.games: set[int] = set()
+        self.pending: deque[str] = deque()
+        self.ready = asyncio.Event()
+
+    def push(self, message: str, resync: Callable[[set[int]], list[str]]):
+        if len(self.pending) >= self.limit:
+            # Too far behind: skip to the current state of its games instead
+            self.pending.clear()
+            self.pending.extend(resync(self.games))
+        else:
+            self.pending.append(message)
+        self.ready.set()
+
+    async def run(self):
+        # Send queued messages as fast as the client takes them
+        while True:
+            await self.ready.wait()
+            while self.pending:
+                await self.websocket.send(self.pending.popleft())
+            self.ready.clear()
+
+
+class GameHub:
+    """
+    Stream many concurrent games to spectators, who each choose the games to
+    watch. See the top of this module for the protocol.
+    """
+    def __init__(self,
+            host: str = LISTEN_HOST,
+            port: int = LISTEN_PORT,
+            queue_size: int = SUBSCRIBER_QUEUE,
+            log_stream: LogStream | None = None,
+        ):
+        self._host = host
+        self._port = port
+        self._queue_size = queue_size
+        self._log = log_stream or NullLogger()
+        self._games: defaultdict[int, _HubGame] = defaultdict(_HubGame)
+
+    def publish(self, game_id: int, message: dict):
+        """
+        Record a serialized game update (or game metadata) of a game, and
+        send it to the game's subscribers. Board updates may carry either the
+        whole board or just the changed cells (see `serialize_game_update`).
+        """
+        game = self._games[game_id]
+        match message.get("type"):
+            case "GameMetadata":
+                game.metadata = message
+            case "GameUpdate:GameBegin":
+                game.board = message["board"]
+                game.updates = game.board_updates = game.turn = 0
+                game.winner = None
+            case "GameUpdate:TurnBegin":
+                game.turn = message["turnId"]
+            case "GameUpdate:BoardUpdate":
+                game.board_updates += 1
+                if "board" in message:
+                    game.board = message["board"]
+                elif game.board is not None:
+                    for r, c, cell in message["cells"]:
+                        game.board[r][c] = cell
+                    if game.board_updates % KEYFRAME_INTERVAL == 0:
+                        message = self._keyframe(game)
+            case "GameUpdate:GameEnd":
+                game.winner = message["winner"]
+
+        # Updates are numbered from GameBegin, as for `RemoteGame`
+        id = None
+        if message["type"] != "GameMetadata":
+            id = game.updates
+            game.updates += 1
+        if not game.subscribers:
+            return
+        message_str = self._encode(game_id, message, id)
+        for subscriber in game.subscribers:
+            subscriber.push(message_str, self._resync)
+
+    def listing(self) -> dict:
+        return {
+            "type": "GameList",
+            "games": [
+                {
+                    "game": game_id,
+                    "players": game.metadata["players"] if game.metadata else [],
+                    "turn": game.turn,
+                    "over": game.winner is not None,
+                    "winner": game.winner,
+                }
+                for game_id, game in sorted(self._games.items())
+            ],
+        }
+
+    def _keyframe(self, game: _HubGame) -> dict:
+        return {
+            "type": "GameUpdate:BoardUpdate",
+            "board": [row[:] for row in game.board or []],
+        }
+
+    def _encode(self, game_id: int, message: dict, id: int | None) -> str:
+        return json.dumps({
+            **message,
+            "game": game_id,
+            "id": id,
+        }, separators=(",", ":"))
+
+    def _resync(self, game_ids: set[int]) -> list[str]:
+        # Everything a client needs to pick up these games from their current
+        # state, regardless of what it has (or hasn't) received before
+        messages = []
+        for game_id in sorted(game_ids):
+            game = self._games.get(game_id)
+            if game is None:
+                continue
+            if game.metadata is not None:
+                messages.append(self._encode(game_id, game.metadata, None))
+            if game.board is not None:
+                messages.append(self._encode(
+                    game_id, self._keyframe(game), game.updates - 1))
+        return messages
+
+    async def _handler(self, websocket):
+        """
+        Handle a client's requests; its updates are sent by its own task.
+        """
+        subscriber = _Subscriber(websocket, self._queue_size)
+        sender = asyncio.create_task(subscriber.run())
+        try:
+            async for message in websocket:
+                self._log.debug(f"received message: {message}")
+
+                try:
+                    message = json.loads(message)
+                    message_type = message["type"]
+                except json.JSONDecodeError as e:
+                    self._log.error(f"failed to parse message: {e}")
+                    return
+                except KeyError as e:
+                    self._log.error(f"missing message type: {e}")
+                    return
+
+                match message_type:
+                    case "<list>":
+                        subscriber.push(json.dumps(
+                            self.listing(), separators=(",", ":")), self._resync)
+                    case "<subscribe>":
+                        game_id = int(message["game"])
+                        subscriber.games.add(game_id)
+                        self._games[game_id].subscribers.add(subscriber)
+                        for message_str in self._resync({game_id}):
+                            subscriber.push(message_str, self._resync)
+                    case "<unsubscribe>":
+                        game_id = int(message["game"])
+                        subscriber.games.discard(game_id)
+                        self._games[game_id].subscribers.discard(subscriber)
+        except websockets.ConnectionClosed:
+            pass # Spectators may leave at any time
+        finally:
+            sender.cancel()
+            for game_id in subscriber.games:
+                self._games[game_id].subscribers.discard(subscriber)
+
+    async def run(self, source: Any = None):
+        """
+        Run the hub. If given, `source` is a (multiprocessing) queue of
+        `(game_id, message)` pairs to publish, e.g. from `hub_publisher`s in
+        other processes, and the hub stops once it takes None from it.
+        """
+        async with websockets.serve(self._handler, self._host, self._port):
+            self._log.info(f"hub listening on ws://{self._host}:{self._port}...")
+            if source is None:
+                await asyncio.Future()
+                return
+
+            loop = asyncio.get_running_loop()
+            done = loop.create_future()
+
+            def _pump():
+                # A daemon thread, so that a blocked `get` never holds up exit
+                while (item := source.get()) is not None:
+                    loop.call_soon_threadsafe(self.publish, *item)
+                loop.call_soon_threadsafe(done.set_result, None)
+
+            threading.Thread(target=_pump, daemon=True).start()
+            await done
+
+
+async def hub_publisher(
+        game_id: int,
+        player_names: list[str],
+        send: Callable[[tuple[int, dict]], Any],
+    ) -> AsyncGenerator:
+    """
+    Event handler passing a game's updates to a `GameHub` with `send` (e.g.
+    the `put` of the queue the hub runs with). Board updates are sent as
+    deltas; the hub itself keyframes them for its clients.
+    """
+    while True:
+        update: GameUpdate | None = yield
+        assert update is not None
+
+        match update:
+            case GameBegin(_):
+                send((game_id, {
+                    "type": "GameMetadata",
+                    "players": player_names,
+                }))
+        send((game_id, serialize_game_update(update, keyframe=False)))
@@ -5,7 +5,7 @@ from dataclasses import asdict
 from typing import Literal
 
 from ..game import *
-from ..game.board import CellState
+from ..game.board import CellState, BoardMutation
 
 
 def serialize_game_board(board: Board) -> list[list[int]]:
@@ -13,13 +13,22 @@ def serialize_game_board(board: Board) -> list[list[int]]:
     Serialize a game board to a dictionary.
     """
     sz_board = [BOARD_N * [0] for _ in range(BOARD_N)]
-    for r in range(BOARD_N):
-        for c in range(BOARD_N):
-            sz_board[r][c] = serialize_game_board_cell(board[Coord(r, c)])
+    for (r, c), cell in board._state.items():
+        sz_board[r][c] = serialize_game_board_cell(cell)
 
     return sz_board
 
 
+def serialize_board_mutation(mutation: BoardMutation) -> list[list[int]]:
+    """
+    Serialize the cells changed by an action as [row, column, cell] triples.
+    """
+    return sorted(
+        [m.cell.r, m.cell.c, serialize_game_board_cell(m.next)]
+        for m in mutation.cell_mutations
+    )
+
+
 def serialize_game_board_cell(cell: CellState) -> int:
     """
     Serialize a game board cell to a dictionary.
@@ -67,9 +76,11 @@ def serialize_game_action(action: Action) -> dict:
             }
 
 
-def serialize_game_update(update: GameUpdate) -> dict:
+def serialize_game_update(update: GameUpdate, keyframe: bool = True) -> dict:
     """
-    Serialize a game update to a dictionary.
+    Serialize a game update to a dictionary. Unless `keyframe` is set, a board
+    update only carries the cells changed by the last action (as "cells")
+    rather than the whole board (as "board").
     """
     update_cls_name = update.__class__.__name__
     update_payload = {}
@@ -98,6 +109,11 @@ def serialize_game_update(update: GameUpdate) -> dict:
                 "action": serialize_game_action(action),
             }
 
+        case BoardUpdate(board) if not keyframe and board._history:
+            update_payload = {
+                "cells": serialize_board_mutation(board._history[-1]),
+            }
+
         case BoardUpdate(board):
             update_payload = {
                 "board": serialize_game_board(board),
@@ -1,7 +1,7 @@
 # COMP30024 Artificial Intelligence, Semester 1 2025
 # Project Part B: Game Playing Agent
 
-from collections import Counter
+from collections import Counter, defaultdict, deque
 from math import inf
 import json
 import asyncio
@@ -11,7 +11,6 @@ from ..log import LogStream, NullLogger
 from .message import Message
 
 
-INCOMING_POLL_INTERVAL = 0.1
 LISTEN_HOST = "0.0.0.0" # For use within dev container
 LISTEN_PORT = 8765
 
@@ -31,7 +30,34 @@ class RemoteServer:
         self._log = log_stream or NullLogger()
 
         self._server = None
-        self._incoming_messages: list[Message] = []
+        self._clients = 0
+        self._connects = 0
+        # Messages received but not yet taken, queued by type. Waiters are
+        # woken through `_changed` whenever a message arrives, the server
+        # starts or a client connects or disconnects (no polling).
+        self._incoming: defaultdict[str, deque[Message]] = defaultdict(deque)
+        self._changed = asyncio.Condition()
+
+    @property
+    def connected(self) -> bool:
+        return self._clients > 0
+
+    @property
+    def connects(self) -> int:
+        """
+        Number of client connections made so far (to detect reconnects).
+        """
+        return self._connects
+
+    def discard(self, message_type: str):
+        """
+        Drop any queued messages of the specified type.
+        """
+        self._incoming[message_type].clear()
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
     
     async def send(self, message: dict, id: int | None = None):
         """
@@ -42,7 +68,7 @@ class RemoteServer:
         message_str = json.dumps({
             **message,
             "id": id,
-        })
+        }, separators=(",", ":"))
         self._log.debug(f"sending message: {message_str}")
 
         if self._server is None:
@@ -70,38 +96,49 @@ class RemoteServer:
         message_type: str | None = None,
     ) -> dict | None:
         """
-        Take the next message from the queue of the specified type and return
-        it. Waits until a message of the specified type is available if none.
+        Take the next message from the queue of the specified type (or of the
+        first type with any waiting, if none is specified) and return it.
+        Waits until such a message is available, or returns None once no
+        client is connected.
         """
-        while self._server and len(self._server.connections) > 0:
-            if message_type is not None:
-                for i, message in enumerate(self._incoming_messages):
-                    if message.type == message_type:
-                        return self._incoming_messages.pop(i).message
-            else:
-                if self._incoming_messages:
-                    return self._incoming_messages.pop(0).message
+        async with self._changed:
+            while self._server and self._clients > 0:
+                if message_type is not None:
+                    queue = self._incoming[message_type]
+                else:
+                    queue = next((q for q in self._incoming.values() if q), None)
+                if queue:
+                    return queue.popleft().message
 
-            await asyncio.sleep(INCOMING_POLL_INTERVAL)
+                await self._changed.wait()
 
     async def _handler(self, websocket):
         """
         Handle incoming then outgoing messages.
         """
-        async for message in websocket:
-            self._log.debug(f"received message: {message}")
-            
-            try:
-                message = json.loads(message)
-                message_type = message["type"]
-            except json.JSONDecodeError as e:
-                self._log.error(f"failed to parse message: {e}")
-                return
-            except KeyError as e:
-                self._log.error(f"missing message type: {e}")
-                return
-
-            self._incoming_messages.append(Message(message_type, message))
+        self._clients += 1
+        self._connects += 1
+        await self._notify()
+        try:
+            async for message in websocket:
+                self._log.debug(f"received message: {message}")
+
+                try:
+                    message = json.loads(message)
+                    message_type = message["type"]
+                except json.JSONDecodeError as e:
+                    self._log.error(f"failed to parse message: {e}")
+                    return
+                except KeyError as e:
+                    self._log.error(f"missing message type: {e}")
+                    return
+
+                self._incoming[message_type].append(
+                    Message(message_type, message))
+                await self._notify()
+        finally:
+            self._clients -= 1
+            await self._notify()
 
     async def run(self):
         """
@@ -111,6 +148,7 @@ class RemoteServer:
             self._log.info(f"server listening on ws://{self._host}:{self._port}...")
             self._server = server
             self._future = asyncio.Future()
+            await self._notify()
             try:
                 await self._future
             except asyncio.CancelledError:
@@ -129,13 +167,12 @@ class RemoteServer:
         """
         Wait for a client to connect.
         """
-        while self._server is None:
-            await asyncio.sleep(INCOMING_POLL_INTERVAL)
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._server is not None)
 
-        self._log.info("waiting for client to connect...")
+            self._log.info("waiting for client to connect...")
 
-        while len(list(self._server.connections)) == 0:
-            await asyncio.sleep(INCOMING_POLL_INTERVAL)
+            await self._changed.wait_for(lambda: self._clients > 0)
 
         await self.sync({"type": "<ping>"})
 
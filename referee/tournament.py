@@ -0,0 +1,362 @@
+# COMP30024 Artificial Intelligence, Semester 1 2025
+# Project Part B: Game Playing Agent
+
+# Headless batch tournament runner. Plays many games between pairs of Agent
+# classes across a pool of worker processes, without any board rendering or
+# commentary, and reports win rates with confidence intervals. Usage:
+#
+#   python -m referee tournament agent agent:MCTSAgent -g 200 -t 30
+#
+# Each game still runs both agents in their own subprocesses with the usual
+# resource limits, exactly as `python -m referee` would (with -w, those
+# subprocesses are kept warm and reused by the worker's later games). With
+# --hub, every game can be watched live through a spectator hub (see
+# `server.hub`), which the workers publish their games' updates to.
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import multiprocessing.queues
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from itertools import combinations
+from typing import AsyncGenerator
+
+from .game import PlayerColor, GAME_NAME
+from .game import TurnEnd, PlayerError, UnhandledError
+from .agent import AgentProxyPlayer, InProcessPlayer, AgentPool
+from .log import NullLogger
+from .options import parse_package_spec, PlayerLoc, \
+    SPACE_LIMIT_DEFAULT, TIME_LIMIT_DEFAULT
+from .run import run_game
+from .server import GameHub, hub_publisher
+from .server.server import LISTEN_PORT
+
+# z-score of the reported (two-sided, 95%) confidence intervals
+CONFIDENCE_Z = 1.96
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    game_id: int
+    red: PlayerLoc
+    blue: PlayerLoc
+    time_limit: float | None
+    space_limit: float | None
+    seed: int
+    in_process: bool = False
+    warm: bool = False
+
+
+@dataclass
+class GameResult:
+    game_id: int
+    red: str
+    blue: str
+    seed: int
+    winner: str | None  # "RED", "BLUE" or None for a draw
+    turns: int
+    error: str | None
+    seconds: float
+    crashed: bool = False  # Ended by a referee error, not by either player
+
+
+def get_tournament_options(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="referee tournament",
+        description=f"Play a batch of {GAME_NAME} games between Agent "
+        "classes and report win rates. With one agent, it plays itself; "
+        "with more, every pair of agents plays the same number of games.",
+    )
+    parser.add_argument(
+        "agents",
+        metavar="AGENT",
+        nargs="+",
+        type=parse_package_spec,
+        help="package specification of an Agent class (as for the referee).",
+    )
+    parser.add_argument(
+        "-g", "--games", type=int, default=100,
+        help="games per pair of agents (default: %(default)s).",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="games played in parallel (default: %(default)s).",
+    )
+    parser.add_argument(
+        "-t", "--time", type=float, default=TIME_LIMIT_DEFAULT,
+        help="CPU time limit (seconds) per agent per game.",
+    )
+    parser.add_argument(
+        "-s", "--space", type=float, default=SPACE_LIMIT_DEFAULT,
+        help="memory limit (MB) per agent.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="seed of the first game; game i is seeded with seed + i.",
+    )
+    parser.add_argument(
+        "--no-swap", action="store_true",
+        help="always give the first agent of each pair RED (by default "
+        "colours alternate between games).",
+    )
+    parser.add_argument(
+        "-I", "--in-process", action="store_true",
+        help="run trusted agents inside the worker processes rather than "
+        "in a subprocess each (much less overhead per call; see "
+        "InProcessPlayer for the caveats).",
+    )
+    parser.add_argument(
+        "-w", "--warm", action="store_true",
+        help="keep each worker's agent subprocesses running between games, "
+        "constructing a new agent in them for each game rather than "
+        "starting (and importing) everything again.",
+    )
+    parser.add_argument(
+        "--hub", metavar="PORT", type=int, nargs="?", const=LISTEN_PORT,
+        default=None,
+        help="serve all games live to spectators, who subscribe to the "
+        "games they want to watch (port %(const)s if not given).",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default=None,
+        help="also write one JSON line per game to this file.",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true",
+        help="only print the final summary.",
+    )
+    return parser.parse_args(argv)
+
+
+def schedule(options: argparse.Namespace) -> list[GameSpec]:
+    agents: list[PlayerLoc] = options.agents
+    pairs = list(combinations(agents, 2)) if len(agents) > 1 \
+        else [(agents[0], agents[0])]
+
+    specs = []
+    for first, second in pairs:
+        for i in range(options.games):
+            red, blue = (first, second) \
+                if options.no_swap or i % 2 == 0 else (second, first)
+            game_id = len(specs)
+            specs.append(GameSpec(
+                game_id, red, blue,
+                options.time, options.space,
+                options.seed + game_id,
+                options.in_process,
+                options.warm,
+            ))
+    return specs
+
+
+# Warm agent processes of this (worker) process. They outlive each game, so
+# all its games run on one event loop, which the subprocesses belong to. When
+# the worker exits, they see EOF and exit too.
+_warm_loop: asyncio.AbstractEventLoop | None = None
+_warm_pool: AgentPool | None = None
+
+
+# Queue of (game_id, message) pairs to the spectator hub, if any (set for each
+# worker when the pool starts it)
+_hub_queue: multiprocessing.queues.Queue | None = None
+
+
+def _init_worker(hub_queue: multiprocessing.queues.Queue | None):
+    global _hub_queue
+    _hub_queue = hub_queue
+
+
+def _warm() -> tuple[asyncio.AbstractEventLoop, AgentPool]:
+    global _warm_loop, _warm_pool
+    if _warm_loop is None or _warm_pool is None:
+        _warm_loop = asyncio.new_event_loop()
+        _warm_pool = AgentPool(size=2)
+    return _warm_loop, _warm_pool
+
+
+def play(spec: GameSpec) -> GameResult:
+    """
+    Play one game to completion (in a worker process).
+    """
+    start = time.time()
+    turns = 0
+    error: str | None = None
+    crashed = False
+
+    async def _observer() -> AsyncGenerator:
+        nonlocal turns, error, crashed
+        while True:
+            update = yield
+            match update:
+                case TurnEnd(turn_id, _, _):
+                    turns = turn_id
+                case PlayerError(message):
+                    error = message
+                case UnhandledError(message):
+                    error = message
+                    crashed = True
+
+    run = asyncio.run
+    pool = None
+    if spec.warm and not spec.in_process:
+        loop, pool = _warm()
+        run = loop.run_until_complete
+
+    if spec.in_process:
+        # Both agents share one `random`, so seed it once
+        players = [
+            InProcessPlayer(
+                f"{loc} [{color}]",
+                color,
+                loc,
+                time_limit=spec.time_limit,
+                space_limit=spec.space_limit,
+                output=False,
+                seed=spec.seed if color == PlayerColor.RED else None,
+            )
+            for color, loc in zip(PlayerColor, (spec.red, spec.blue))
+        ]
+    else:
+        players = [
+            AgentProxyPlayer(
+                f"{loc} [{color}]",
+                color,
+                loc,
+                time_limit=spec.time_limit,
+                space_limit=spec.space_limit,
+                log=NullLogger(),
+                subproc_output=False,
+                # Distinct, reproducible streams for the two agents
+                seed=2 * spec.seed + color.value,
+                pool=pool,
+            )
+            for color, loc in zip(PlayerColor, (spec.red, spec.blue))
+        ]
+    event_handlers = [_observer()]
+    if _hub_queue is not None:
+        event_handlers.append(hub_publisher(
+            spec.game_id, [str(spec.red), str(spec.blue)], _hub_queue.put))
+    try:
+        winner = run(run_game(players, event_handlers))
+        winner_str = str(winner.color) if winner is not None else None
+    except Exception as e:
+        winner_str = None
+        error = error or f"unhandled exception: {e}"
+        crashed = True
+
+    return GameResult(
+        spec.game_id, str(spec.red), str(spec.blue), spec.seed,
+        winner_str, turns, error, round(time.time() - start, 3), crashed,
+    )
+
+
+def wilson_interval(score: float, n: int, z: float = CONFIDENCE_Z) \
+        -> tuple[float, float]:
+    """
+    Wilson score interval for a proportion `score` observed over `n` games.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    denom = 1 + z * z / n
+    centre = (score + z * z / (2 * n)) / denom
+    half = z * math.sqrt(score * (1 - score) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def summarise(results: list[GameResult], elapsed: float) -> str:
+    """
+    One line per pair of agents, from the perspective of the first (in
+    sorted order; RED's perspective for self-play), with draws counting as
+    half a win, then the overall throughput. Games that crashed (rather than
+    being lost by a player's error) have no result, so they are only counted
+    as errors.
+    """
+    tallies: dict[tuple[str, str], Counter] = {}
+    for r in results:
+        a, b = sorted((r.red, r.blue))
+        tally = tallies.setdefault((a, b), Counter())
+        tally["errors"] += r.error is not None
+        if r.crashed:
+            continue
+        if r.winner is None:
+            tally["draws"] += 1
+        elif a == b:
+            tally["wins" if r.winner == str(PlayerColor.RED) else "losses"] += 1
+        else:
+            winner = r.red if r.winner == str(PlayerColor.RED) else r.blue
+            tally["wins" if winner == a else "losses"] += 1
+
+    lines = []
+    for (a, b), tally in sorted(tallies.items()):
+        wins, losses, draws = tally["wins"], tally["losses"], tally["draws"]
+        n = wins + losses + draws
+        score = (wins + 0.5 * draws) / n if n else 0.0
+        low, high = wilson_interval(score, n)
+        label = f"{a} vs {b}" if a != b else f"{a} (RED vs BLUE)"
+        lines.append(
+            f"{label}: {wins}W {losses}L {draws}D ({tally['errors']} errors), "
+            f"score {score:.3f} [{low:.3f}, {high:.3f}] over {n} games"
+        )
+    rate = len(results) / elapsed * 3600 if elapsed > 0 else 0.0
+    lines.append(f"{len(results)} games in {elapsed:.1f}s ({rate:.0f} games/hour)")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None):
+    options = get_tournament_options(sys.argv[2:] if argv is None else argv)
+    specs = schedule(options)
+    output = open(options.output, "w") if options.output else None
+
+    hub_queue = hub_thread = None
+    if options.hub is not None:
+        # The hub serves spectators from a thread of this process
+        hub_queue = multiprocessing.Queue()
+        hub = GameHub(port=options.hub)
+        hub_thread = threading.Thread(
+            target=asyncio.run, args=(hub.run(hub_queue),), daemon=True
+        )
+        hub_thread.start()
+        print(f"spectator hub listening on port {options.hub}", flush=True)
+
+    results: list[GameResult] = []
+    start = time.time()
+    try:
+        with ProcessPoolExecutor(
+                max_workers=options.jobs,
+                initializer=_init_worker,
+                initargs=(hub_queue,)) as pool:
+            futures = [pool.submit(play, spec) for spec in specs]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if output is not None:
+                    output.write(json.dumps(asdict(result)) + "\n")
+                    output.flush()
+                if not options.quiet:
+                    print(
+                        f"[{len(results)}/{len(specs)}] game {result.game_id}: "
+                        f"{result.red} (RED) vs {result.blue} (BLUE) -> "
+                        f"{result.winner or 'draw'} in {result.turns} turns"
+                        + (f" ({result.error.splitlines()[0]})" if result.error else ""),
+                        flush=True,
+                    )
+    except KeyboardInterrupt:
+        print("interrupted; summarising the games played so far")
+    finally:
+        if output is not None:
+            output.close()
+        if hub_queue is not None and hub_thread is not None:
+            # After every worker's updates (the workers have exited), so the
+            # hub publishes them all before it stops
+            hub_queue.put(None)
+            hub_thread.join(timeout=5)
+
+    print(summarise(results, time.time() - start))
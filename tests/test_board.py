@@ -0,0 +1,64 @@
+# Invariants of the agent's bitboard `Board`, checked against the referee's
+# own board over random games.
+
+import random
+
+import pytest
+
+from referee.game import Board as RefereeBoard, PlayerColor, Coord, GrowAction, \
+    BOARD_N
+from agent.board import Board, ME, ENEMY
+from agent.movegen import MoveGenerator
+
+GAMES = 6
+
+
+def _snapshot(board: Board) -> tuple:
+    return (tuple(board.frogs), board.pads, tuple(board.reached),
+            tuple(board.distance), board.key, board.to_move)
+
+
+def _check_matches_referee(board: Board, referee: RefereeBoard):
+    for r in range(BOARD_N):
+        for c in range(BOARD_N):
+            bit = 1 << (r * BOARD_N + c)
+            cell = (bool(board.frogs[ME] & bit), bool(board.frogs[ENEMY] & bit),
+                    bool(board.pads & bit))
+            state = referee[Coord(r, c)].state
+            expected = (state == board.colors[ME], state == board.colors[ENEMY],
+                        state == "LilyPad")
+            assert cell == expected, (r, c, state)
+    assert board.to_move == (ME if referee.turn_color == board.color else ENEMY)
+
+
+def _check_incremental(board: Board):
+    assert board.key == board.compute_key()
+    for side in (ME, ENEMY):
+        assert (board.reached[side], board.distance[side]) == board.tally(side)
+
+
+@pytest.mark.parametrize("color", list(PlayerColor))
+def test_random_games(color):
+    rng = random.Random(color.value)
+    movegen = MoveGenerator()
+    for _ in range(GAMES):
+        referee, board = RefereeBoard(), Board(color)
+        board.initialize()
+        while not referee.game_over:
+            _check_matches_referee(board, referee)
+            _check_incremental(board)
+
+            # Every legal action is undone exactly
+            before = _snapshot(board)
+            actions = movegen.actions(board, board.to_move)
+            if not any(isinstance(a, GrowAction) for a in actions):
+                actions.append(GrowAction())  # Always legal
+            for action in actions:
+                undo = board.make(action)
+                _check_incremental(board)
+                board.unmake(undo)
+                assert _snapshot(board) == before, action
+
+            action = rng.choice(actions)
+            board.make(action)
+            referee.apply_action(action)
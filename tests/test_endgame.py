@@ -0,0 +1,57 @@
+# Loading and appending to the endgame solver's cache file.
+
+from referee.game import PlayerColor
+from agent.board import Board, ME
+from agent.book import book_key, encode
+from agent.endgame import EndgameSolver, RECORD
+from agent.movegen import MoveGenerator
+from agent.tt import TranspositionTable
+
+
+def _solver(path, writable=False):
+    solver = EndgameSolver(MoveGenerator(), TranspositionTable(1), None, path, writable)
+    solver._load()
+    return solver
+
+
+def test_partial_record_ignored(tmp_path):
+    path = tmp_path / "endgame.bin"
+    record = RECORD.pack(42, 3, 0, 0, 0)
+    path.write_bytes(record + record[:RECORD.size - 6])  # A cut-short write
+
+    solver = _solver(path, writable=True)
+    assert solver._solved == {42: (3, 0, 0, 0)}
+    assert path.stat().st_size == RECORD.size  # Partial record dropped
+
+
+def test_read_only_by_default(tmp_path):
+    path = tmp_path / "endgame.bin"
+    data = RECORD.pack(42, 3, 0, 0, 0)[:-1]
+    path.write_bytes(data)
+
+    solver = _solver(path)
+    solver._remember(7, 2, solver.movegen.actions(_board(), ME)[0])
+    assert 7 in solver._solved
+    assert path.read_bytes() == data  # Neither truncated nor appended to
+
+
+def test_unreadable_cache_is_empty(tmp_path):
+    assert _solver(tmp_path / "missing.bin")._solved == {}
+    assert _solver(tmp_path)._solved == {}  # A directory, not a file
+
+
+def test_cached_solution_within_max_moves(tmp_path):
+    board = _board()
+    solver = _solver(tmp_path / "endgame.bin")
+    action = solver.movegen.actions(board, ME)[0]
+    solver._solved[book_key(board)] = (5, *encode(action))
+
+    assert solver.solve(board, max_moves=5, time_limit=0.0) == (5, action)
+    # Too long for the caller; no shorter solution is searched for either
+    assert solver.solve(board, max_moves=4, time_limit=0.0) is None
+
+
+def _board():
+    board = Board(PlayerColor.RED)
+    board.initialize()
+    return board
@@ -0,0 +1,40 @@
+# Tree growth invariants of the MCTS agent.
+
+from referee.game import PlayerColor
+from agent.mcts import MCTSAgent
+
+
+def _depth(node) -> int:
+    return 1 + max((_depth(c) for c in node.children.values()), default=0)
+
+
+def _check_visits(node, batch: int):
+    # Every visit to a node after the one that created it went to a child
+    created = batch if node.parent is not None else 0
+    assert node.visits == created + sum(c.visits for c in node.children.values())
+    for child in node.children.values():
+        _check_visits(child, batch)
+
+
+def test_tree_grows():
+    agent = MCTSAgent(PlayerColor.RED)
+    agent.rng.seed(0)
+    for _ in range(300):
+        agent.iterate()
+
+    root = agent.root
+    assert root.visits == 300 * agent.batch
+    assert _depth(root) >= 3  # grandchildren of the root exist
+    _check_visits(root, agent.batch)
+
+
+def test_children_not_replaced():
+    agent = MCTSAgent(PlayerColor.RED)
+    agent.rng.seed(1)
+    moves = len(agent._expand(agent.root))
+    for _ in range(moves):
+        agent.iterate()
+    # One child per move, each created once
+    assert len(agent.root.children) == moves
+    assert not agent.root.untried
+    assert all(c.visits == agent.batch for c in agent.root.children.values())
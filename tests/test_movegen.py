@@ -0,0 +1,85 @@
+# The agent's move generator, checked against the referee's rules over
+# random games.
+
+import random
+
+import pytest
+
+from referee.game import Board as RefereeBoard, PlayerColor, Coord, Direction, \
+    MoveAction, GrowAction, IllegalActionException, BOARD_N
+from agent.board import Board
+from agent.movegen import MoveGenerator
+
+GAMES = 4
+
+
+def _landing(referee: RefereeBoard, action: MoveAction) -> Coord | None:
+    """
+    Where the referee moves the frog for `action`, or None if it's illegal.
+    """
+    try:
+        mutation = referee.apply_action(action)
+    except IllegalActionException:
+        return None
+    referee.undo_action()
+    return next(m.cell for m in mutation.cell_mutations if m.cell != action.coord)
+
+
+def _referee_moves(referee: RefereeBoard) -> set[tuple[Coord, Coord]]:
+    """
+    (frog, destination) of every move the referee allows the side to move,
+    searching jump chains breadth first. Frogs already on their goal row are
+    left out, as the agent never moves them.
+    """
+    color = referee.turn_color
+    goal_row = BOARD_N - 1 if color == PlayerColor.RED else 0
+    moves = set()
+    for r in range(BOARD_N):
+        for c in range(BOARD_N):
+            start = Coord(r, c)
+            if referee[start].state != color or r == goal_row:
+                continue
+            chains = [()]
+            seen = {start}
+            while chains:
+                path = chains.pop()
+                for d in Direction:
+                    dest = _landing(referee, MoveAction(start, path + (d,)))
+                    if dest is None:
+                        continue
+                    moves.add((start, dest))
+                    # A step ends the move; a jump may be followed by another
+                    is_step = abs(dest.r - start.r) <= 1 and abs(dest.c - start.c) <= 1
+                    if not (is_step and not path) and dest not in seen:
+                        seen.add(dest)
+                        chains.append(path + (d,))
+    return moves
+
+
+@pytest.mark.parametrize("color", list(PlayerColor))
+def test_random_games(color):
+    rng = random.Random(color.value)
+    movegen = MoveGenerator()
+    for _ in range(GAMES):
+        referee, board = RefereeBoard(), Board(color)
+        board.initialize()
+        while not referee.game_over:
+            side = board.to_move
+            actions = movegen.actions(board, side)
+
+            # The cached moves are those of a fresh generator...
+            assert actions == MoveGenerator().actions(board, side)
+            # ...every one is legal, with the destination the agent expects...
+            moves = set()
+            for action in actions:
+                if isinstance(action, GrowAction):
+                    continue
+                dest = board.follow_directions(action.coord, action.directions)
+                assert _landing(referee, action) == dest, action
+                moves.add((action.coord, dest))
+            # ...and they reach every destination the referee allows
+            assert moves == _referee_moves(referee)
+
+            action = rng.choice(actions) if actions else GrowAction()
+            board.make(action)
+            referee.apply_action(action)
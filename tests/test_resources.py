@@ -0,0 +1,24 @@
+# Space accounting of agent processes.
+
+from pathlib import Path
+
+import pytest
+
+from referee.agent.resources import MemoryWatcher, set_space_line
+
+
+@pytest.mark.skipif(not Path("/proc/self/status").exists(), reason="needs procfs")
+def test_peak_not_charged_to_next_game():
+    set_space_line()
+    first = MemoryWatcher(0)
+    with first:
+        big = bytearray(200 << 20)
+    assert first.peak() >= 200
+    del big
+
+    # A warm process resets its watcher for the next game
+    second = MemoryWatcher(0)
+    with second:
+        small = bytearray(10 << 20)
+    assert second.peak() < 100
+    del small
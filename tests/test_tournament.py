@@ -0,0 +1,19 @@
+# Scoring of tournament results.
+
+from referee.tournament import GameResult, summarise
+
+
+def _result(winner, error=None, crashed=False):
+    return GameResult(0, "a", "b", 0, winner, 10, error, 1.0, crashed)
+
+
+def test_crashes_not_scored():
+    results = [
+        _result("RED"),
+        _result("BLUE", error="ILLEGAL ACTION: ..."),  # A loss for RED
+        _result(None),
+        _result(None, error="unhandled exception: ...", crashed=True),
+    ]
+    line = summarise(results, 1.0).splitlines()[0]
+    assert line.startswith("a vs b: 1W 1L 1D (2 errors), score 0.500")
+    assert line.endswith("over 3 games")